@@ -1,25 +1,268 @@
 import sqlite3
+import atexit
+import copy
 import json
+import queue
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Literal
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Literal, Callable
 import os
 from pathlib import Path
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Define types for chat settings
 DocumentAnalysisMode = Literal["off", "auto"]
 
+# INSERT/UPDATE ... RETURNING needs SQLite 3.35+, window functions need 3.25+
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_SQLITE_HAS_WINDOW = sqlite3.sqlite_version_info >= (3, 25, 0)
+
+# Bumped whenever _create_tables gains a one-off migration step; stored in
+# PRAGMA user_version so each database file is migrated only once
+_SCHEMA_VERSION = 1
+
+
+def _dump_json(value: Any) -> str:
+    """Serialize a JSON column value, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+# Sentinel for "key not cached" (None is a valid cached settings value)
+_CACHE_MISS = object()
+
+
+@lru_cache(maxsize=64)
+def _build_update_sql(table: str, set_columns: tuple, where_column: str) -> str:
+    """Build an UPDATE statement for the given columns (memoized per column set)"""
+    assignments = ", ".join(f"{column} = ?" for column in set_columns)
+    return f"UPDATE {table} SET {assignments} WHERE {where_column} = ?"
+
 
 class ChatSQLiteCRUD:
+    # Fixed UPDATE statements: a NULL parameter keeps the stored value, so every
+    # call shares one prepared statement regardless of which fields are passed
+    _SQL_UPDATE_CHAT_RESPONSE = """
+        UPDATE chat_history
+        SET response = ?,
+            updated_at = ?,
+            tokens_used = COALESCE(?, tokens_used),
+            generation_time = COALESCE(?, generation_time)
+        WHERE chatid = ?
+    """
+
+    _SQL_UPDATE_SETTINGS = """
+        UPDATE chat_settings
+        SET system_prompt = COALESCE(?, system_prompt),
+            user_name = COALESCE(?, user_name),
+            model = COALESCE(?, model),
+            prompt_template_id = COALESCE(?, prompt_template_id),
+            top_p = COALESCE(?, top_p),
+            top_k = COALESCE(?, top_k),
+            document_analysis_mode = COALESCE(?, document_analysis_mode),
+            enable_thinking = COALESCE(?, enable_thinking),
+            max_previous_memory_retention = COALESCE(?, max_previous_memory_retention),
+            chat_id = COALESCE(?, chat_id),
+            is_global = COALESCE(?, is_global),
+            updated_at = ?
+        WHERE id = ?
+    """
+
+    _SQL_UPDATE_SETTINGS_BY_CHAT_ID = """
+        UPDATE chat_settings
+        SET system_prompt = COALESCE(?, system_prompt),
+            user_name = COALESCE(?, user_name),
+            model = COALESCE(?, model),
+            prompt_template_id = COALESCE(?, prompt_template_id),
+            top_p = COALESCE(?, top_p),
+            top_k = COALESCE(?, top_k),
+            document_analysis_mode = COALESCE(?, document_analysis_mode),
+            enable_thinking = COALESCE(?, enable_thinking),
+            max_previous_memory_retention = COALESCE(?, max_previous_memory_retention),
+            is_global = COALESCE(?, is_global),
+            updated_at = ?
+        WHERE chat_id = ?
+    """
+
+    # Bounds for the in-process read caches
+    _SETTINGS_CACHE_SIZE = 256
+    _SESSION_CACHE_SIZE = 256
+
+    # Session "touch" writes are buffered and flushed after this many distinct
+    # sessions or this many seconds, whichever comes first
+    _SESSION_TOUCH_FLUSH_COUNT = 32
+    _SESSION_TOUCH_FLUSH_INTERVAL = 2.0
+
+    # All writes go through a single writer thread, which commits whatever is
+    # queued (up to _WRITE_BATCH_SIZE jobs) in one transaction
+    _WRITE_BATCH_SIZE = 64
+    _WRITE_QUEUE_SIZE = 1024
+
     def __init__(self, db_path: str = "database/chat_history.db"):
         """Initialize the SQLite CRUD operations for chat history"""
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
+        self._settings_cache: OrderedDict = OrderedDict()
+        self._session_cache: OrderedDict = OrderedDict()
+        # Bumped by every invalidation, so a read that raced a write does not
+        # put the row it loaded before that write back into the cache
+        self._cache_generation: Dict[int, int] = {
+            id(self._settings_cache): 0,
+            id(self._session_cache): 0,
+        }
+        self._touch_lock = threading.Lock()
+        self._session_touch: Dict[str, float] = {}
+        self._touch_timer: Optional[threading.Timer] = None
         self._create_tables()
+        self._write_q: queue.Queue = queue.Queue(maxsize=self._WRITE_QUEUE_SIZE)
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="sqlite-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.flush_session_touches)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's long-lived connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # A larger statement cache keeps every query in this class prepared
+            conn = sqlite3.connect(self.db_path, cached_statements=512)
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, job: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run job(conn) on the writer thread and return its result once committed"""
+        if threading.current_thread() is self._writer:
+            return job(self._connect())
+        future: Future = Future()
+        self._write_q.put((job, future))
+        return future.result()
+
+    def _writer_loop(self) -> None:
+        """Commit queued write jobs in batches, isolating each job in a savepoint"""
+        conn = self._connect()
+        while True:
+            batch = [self._write_q.get()]
+            try:
+                while len(batch) < self._WRITE_BATCH_SIZE:
+                    batch.append(self._write_q.get_nowait())
+            except queue.Empty:
+                pass
+
+            outcomes = []
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for job, future in batch:
+                    # A failing job is rolled back on its own and reported to its
+                    # caller without discarding the rest of the batch
+                    conn.execute("SAVEPOINT write_job")
+                    try:
+                        outcomes.append((future, job(conn), None))
+                    except Exception as exc:
+                        conn.execute("ROLLBACK TO write_job")
+                        outcomes.append((future, None, exc))
+                    conn.execute("RELEASE write_job")
+                conn.commit()
+            except Exception as exc:
+                if conn.in_transaction:
+                    conn.rollback()
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+
+            for future, result, exc in outcomes:
+                if exc is not None:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+
+    def _cache_get(self, cache: OrderedDict, key) -> Any:
+        """Return a copy of a cached value, or _CACHE_MISS"""
+        with self._cache_lock:
+            if key not in cache:
+                return _CACHE_MISS
+            cache.move_to_end(key)
+            return copy.deepcopy(cache[key])
+
+    def _cache_miss_generation(self, cache: OrderedDict) -> int:
+        """Generation to pass to _cache_put, read before loading a missed value"""
+        with self._cache_lock:
+            return self._cache_generation[id(cache)]
+
+    def _cache_put(
+        self, cache: OrderedDict, key, value, maxsize: int, generation: int
+    ) -> None:
+        """
+        Store a copy of value, evicting the least recently used entry. Skipped if
+        the cache was invalidated since generation was read, as value may be stale.
+        """
+        with self._cache_lock:
+            if self._cache_generation[id(cache)] != generation:
+                return
+            cache[key] = copy.deepcopy(value)
+            cache.move_to_end(key)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+
+    def _invalidate_settings(self) -> None:
+        """Drop every cached settings lookup after a chat_settings write"""
+        with self._cache_lock:
+            self._settings_cache.clear()
+            self._cache_generation[id(self._settings_cache)] += 1
+
+    def _invalidate_session(self, session_id: str) -> None:
+        """Drop a cached session after it was modified"""
+        with self._cache_lock:
+            self._session_cache.pop(session_id, None)
+            self._cache_generation[id(self._session_cache)] += 1
+
+    @staticmethod
+    def _tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+        """Cursor yielding raw tuples, whatever row_factory the connection has"""
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor
+
+    @staticmethod
+    def _rows_as_dicts(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+        """Build result dicts straight from raw tuples, reading column names once"""
+        columns = tuple(column[0] for column in cursor.description)
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _execute_delete(conn: sqlite3.Connection, sql: str, params: tuple) -> bool:
+        """Run a DELETE statement and report whether any row was removed"""
+        if not _SQLITE_HAS_RETURNING:
+            return conn.execute(sql, params).rowcount > 0
+
+        cursor = conn.execute(f"{sql} RETURNING 1", params)
+        deleted = cursor.fetchone() is not None
+        # Reset the statement so the remaining RETURNING rows don't block COMMIT
+        cursor.close()
+        return deleted
 
     def _create_tables(self):
         """Create the chat_history, chat_settings, chat_sessions, and research_sessions tables if they don't exist"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            migrate = (
+                conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION
+            )
+
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS chat_history (
@@ -34,7 +277,8 @@ class ChatSQLiteCRUD:
                     datetime_generated TEXT NOT NULL,
                     metadata TEXT,  -- JSON string containing additional metadata
                     created_at REAL,  -- timestamp
-                    updated_at REAL   -- timestamp
+                    updated_at REAL,  -- timestamp
+                    session_id TEXT REFERENCES chat_sessions(session_id) ON DELETE CASCADE
                 )
             """
             )
@@ -43,10 +287,17 @@ class ChatSQLiteCRUD:
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_chatid ON chat_history(chatid)"
             )
+            if migrate:
+                conn.execute("DROP INDEX IF EXISTS idx_datetime")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ch_created ON chat_history(created_at DESC)"
+            )
+            # model lookups are always ordered by recency, so index both together
+            if migrate:
+                conn.execute("DROP INDEX IF EXISTS idx_model")
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_datetime ON chat_history(datetime_generated)"
+                "CREATE INDEX IF NOT EXISTS idx_ch_model_created ON chat_history(model, created_at DESC)"
             )
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_model ON chat_history(model)")
 
             # Create chat_settings table
             conn.execute(
@@ -74,11 +325,30 @@ class ChatSQLiteCRUD:
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_settings_chat_id ON chat_settings(chat_id)"
             )
+            # The global settings lookup is served by the partial unique index
+            # uq_settings_global below
+            if migrate:
+                conn.execute("DROP INDEX IF EXISTS idx_settings_global")
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_settings_global ON chat_settings(is_global)"
+                "CREATE INDEX IF NOT EXISTS idx_settings_template ON chat_settings(prompt_template_id)"
             )
+
+            # Only one global settings row may exist; keep the most recent one
+            # from older databases before enforcing it
+            if migrate:
+                conn.execute(
+                    """
+                    UPDATE chat_settings SET is_global = 0
+                    WHERE is_global = 1 AND id NOT IN (
+                        SELECT id FROM chat_settings
+                        WHERE is_global = 1
+                        ORDER BY updated_at DESC
+                        LIMIT 1
+                    )
+                """
+                )
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_settings_template ON chat_settings(prompt_template_id)"
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_settings_global ON chat_settings(is_global) WHERE is_global = 1"
             )
 
             # Create chat_sessions table
@@ -104,16 +374,30 @@ class ChatSQLiteCRUD:
             )
 
             # Add session_id column to chat_history if it doesn't exist (migration)
-            try:
-                conn.execute("ALTER TABLE chat_history ADD COLUMN session_id TEXT")
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_chat_history_session_id ON chat_history(session_id)"
-                )
-            except sqlite3.OperationalError:
-                # Column already exists, just ensure index exists
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_chat_history_session_id ON chat_history(session_id)"
+            if migrate:
+                columns = {
+                    row[1] for row in conn.execute("PRAGMA table_info(chat_history)")
+                }
+                if "session_id" not in columns:
+                    conn.execute("ALTER TABLE chat_history ADD COLUMN session_id TEXT")
+
+            # Databases created before the foreign key existed cannot cascade
+            self._session_fk = any(
+                row[2] == "chat_sessions"
+                for row in conn.execute("PRAGMA foreign_key_list(chat_history)")
+            )
+
+            # Covering index for per-session reads: rows come back already sorted
+            # by created_at and the session stats aggregate never touches the table
+            if migrate:
+                conn.execute("DROP INDEX IF EXISTS idx_chat_history_session_id")
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_ch_session_created ON chat_history(
+                    session_id, created_at, model, generation_time, tokens_used, datetime_generated
                 )
+            """
+            )
 
             # Create research_sessions table
             conn.execute(
@@ -152,6 +436,9 @@ class ChatSQLiteCRUD:
                 "CREATE INDEX IF NOT EXISTS idx_research_created_at ON research_sessions(created_at)"
             )
 
+            if migrate:
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
     def create_chat_entry(
         self,
         prompt: str,
@@ -180,69 +467,45 @@ class ChatSQLiteCRUD:
             chatid: The UUID of the created chat entry
         """
         chatid = str(uuid.uuid4())
-        now = datetime.now()
-        timestamp = now.timestamp()
+        timestamp = time.time()
 
-        metadata_json = json.dumps(metadata) if metadata else None
+        metadata_json = _dump_json(metadata) if metadata else None
 
-        with sqlite3.connect(self.db_path) as conn:
-            # Check if session_id column exists (for backward compatibility)
-            cursor = conn.execute("PRAGMA table_info(chat_history)")
-            columns = [row[1] for row in cursor.fetchall()]
-
-            if "session_id" in columns:
-                conn.execute(
-                    """
-                    INSERT INTO chat_history (
-                        chatid, prompt, response, model, thinking,
-                        generation_time, tokens_used, datetime_generated,
-                        metadata, created_at, updated_at, session_id
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        chatid,
-                        prompt,
-                        response,
-                        model,
-                        thinking,
-                        generation_time,
-                        tokens_used,
-                        now.isoformat(),
-                        metadata_json,
-                        timestamp,
-                        timestamp,
-                        session_id,
-                    ),
-                )
-            else:
-                conn.execute(
-                    """
-                    INSERT INTO chat_history (
-                        chatid, prompt, response, model, thinking,
-                        generation_time, tokens_used, datetime_generated,
-                        metadata, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        chatid,
-                        prompt,
-                        response,
-                        model,
-                        thinking,
-                        generation_time,
-                        tokens_used,
-                        now.isoformat(),
-                        metadata_json,
-                        timestamp,
-                        timestamp,
-                    ),
+        def insert(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                """
+                INSERT INTO chat_history (
+                    chatid, prompt, response, model, thinking,
+                    generation_time, tokens_used, datetime_generated,
+                    metadata, created_at, updated_at, session_id
+                ) VALUES (
+                    ?, ?, ?, ?, ?, ?, ?,
+                    strftime('%Y-%m-%dT%H:%M:%f', ?, 'unixepoch', 'localtime'),
+                    ?, ?, ?, ?
                 )
+            """,
+                (
+                    chatid,
+                    prompt,
+                    response,
+                    model,
+                    thinking,
+                    generation_time,
+                    tokens_used,
+                    timestamp,
+                    metadata_json,
+                    timestamp,
+                    timestamp,
+                    session_id,
+                ),
+            )
 
+        self._write(insert)
         return chatid
 
     def get_chat_by_id(self, chatid: str) -> Optional[Dict[str, Any]]:
         """Get a chat entry by its chatid"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 "SELECT * FROM chat_history WHERE chatid = ?", (chatid,)
@@ -259,9 +522,8 @@ class ChatSQLiteCRUD:
 
     def get_all_chats(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """Get all chat entries with pagination"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        with self._connect() as conn:
+            cursor = self._tuple_cursor(conn).execute(
                 """
                 SELECT * FROM chat_history
                 ORDER BY created_at DESC
@@ -271,8 +533,7 @@ class ChatSQLiteCRUD:
             )
 
             results = []
-            for row in cursor.fetchall():
-                result = dict(row)
+            for result in self._rows_as_dicts(cursor):
                 if result["metadata"]:
                     result["metadata"] = json.loads(result["metadata"])
                 results.append(result)
@@ -281,9 +542,8 @@ class ChatSQLiteCRUD:
 
     def get_chats_by_model(self, model: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get chat entries by model"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        with self._connect() as conn:
+            cursor = self._tuple_cursor(conn).execute(
                 """
                 SELECT * FROM chat_history
                 WHERE model = ?
@@ -294,8 +554,7 @@ class ChatSQLiteCRUD:
             )
 
             results = []
-            for row in cursor.fetchall():
-                result = dict(row)
+            for result in self._rows_as_dicts(cursor):
                 if result["metadata"]:
                     result["metadata"] = json.loads(result["metadata"])
                 results.append(result)
@@ -306,20 +565,22 @@ class ChatSQLiteCRUD:
         self, start_date: str, end_date: str
     ) -> List[Dict[str, Any]]:
         """Get chat entries within a date range (ISO format: YYYY-MM-DDTHH:MM:SS)"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        # Compare on the numeric created_at column instead of the ISO text
+        start_ts = datetime.fromisoformat(start_date).timestamp()
+        end_ts = datetime.fromisoformat(end_date).timestamp()
+
+        with self._connect() as conn:
+            cursor = self._tuple_cursor(conn).execute(
                 """
                 SELECT * FROM chat_history
-                WHERE datetime_generated BETWEEN ? AND ?
-                ORDER BY datetime_generated DESC
+                WHERE created_at BETWEEN ? AND ?
+                ORDER BY created_at DESC
             """,
-                (start_date, end_date),
+                (start_ts, end_ts),
             )
 
             results = []
-            for row in cursor.fetchall():
-                result = dict(row)
+            for result in self._rows_as_dicts(cursor):
                 if result["metadata"]:
                     result["metadata"] = json.loads(result["metadata"])
                 results.append(result)
@@ -334,40 +595,33 @@ class ChatSQLiteCRUD:
         generation_time: Optional[float] = None,
     ) -> bool:
         """Update an existing chat entry's response and related fields"""
-        update_fields = ["response = ?", "updated_at = ?"]
-        params = [new_response, datetime.now().timestamp()]
-
-        if tokens_used is not None:
-            update_fields.append("tokens_used = ?")
-            params.append(tokens_used)
-
-        if generation_time is not None:
-            update_fields.append("generation_time = ?")
-            params.append(generation_time)
-
-        params.append(chatid)  # WHERE clause
-
-        query = f"""
-            UPDATE chat_history
-            SET {', '.join(update_fields)}
-            WHERE chatid = ?
-        """
-
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
+        def update(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(
+                self._SQL_UPDATE_CHAT_RESPONSE,
+                (
+                    new_response,
+                    time.time(),
+                    tokens_used,
+                    generation_time,
+                    chatid,
+                ),
+            )
             return cursor.rowcount > 0
 
+        return self._write(update)
+
     def delete_chat(self, chatid: str) -> bool:
         """Delete a chat entry by chatid"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM chat_history WHERE chatid = ?", (chatid,)
+        def delete(conn: sqlite3.Connection) -> bool:
+            return self._execute_delete(
+                conn, "DELETE FROM chat_history WHERE chatid = ?", (chatid,)
             )
-            return cursor.rowcount > 0
+
+        return self._write(delete)
 
     def get_chat_stats(self) -> Dict[str, Any]:
         """Get statistics about the chat history"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 """
                 SELECT
@@ -395,9 +649,8 @@ class ChatSQLiteCRUD:
         """Search chats by prompt or response content"""
         search_pattern = f"%{query}%"
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        with self._connect() as conn:
+            cursor = self._tuple_cursor(conn).execute(
                 """
                 SELECT * FROM chat_history
                 WHERE prompt LIKE ? OR response LIKE ?
@@ -408,8 +661,7 @@ class ChatSQLiteCRUD:
             )
 
             results = []
-            for row in cursor.fetchall():
-                result = dict(row)
+            for result in self._rows_as_dicts(cursor):
                 if result["metadata"]:
                     result["metadata"] = json.loads(result["metadata"])
                 results.append(result)
@@ -451,9 +703,9 @@ class ChatSQLiteCRUD:
         Returns:
             settings_id: The ID of the created settings entry
         """
-        timestamp = datetime.now().timestamp()
+        timestamp = time.time()
 
-        with sqlite3.connect(self.db_path) as conn:
+        def insert(conn: sqlite3.Connection) -> int:
             cursor = conn.execute(
                 """
                 INSERT INTO chat_settings (
@@ -462,7 +714,8 @@ class ChatSQLiteCRUD:
                     max_previous_memory_retention, chat_id, is_global,
                     created_at, updated_at
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            """
+                + (" RETURNING id" if _SQLITE_HAS_RETURNING else ""),
                 (
                     system_prompt,
                     user_name,
@@ -479,7 +732,11 @@ class ChatSQLiteCRUD:
                     timestamp,
                 ),
             )
-            return cursor.lastrowid
+            return cursor.fetchone()[0] if _SQLITE_HAS_RETURNING else cursor.lastrowid
+
+        settings_id = self._write(insert)
+        self._invalidate_settings()
+        return settings_id
 
     def get_chat_settings(
         self, chat_id: Optional[str] = None, is_global: bool = True
@@ -494,7 +751,16 @@ class ChatSQLiteCRUD:
         Returns:
             Settings dictionary or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        if not chat_id and not is_global:
+            return None
+
+        cache_key = (chat_id, is_global)
+        cached = self._cache_get(self._settings_cache, cache_key)
+        if cached is not _CACHE_MISS:
+            return cached
+        generation = self._cache_miss_generation(self._settings_cache)
+
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
 
             if chat_id:
@@ -502,22 +768,25 @@ class ChatSQLiteCRUD:
                     "SELECT * FROM chat_settings WHERE chat_id = ?", (chat_id,)
                 )
             elif is_global:
+                # "is_global = 1" (not TRUE) so the partial index predicate matches
                 cursor = conn.execute(
-                    "SELECT * FROM chat_settings WHERE is_global = TRUE ORDER BY updated_at DESC LIMIT 1"
+                    "SELECT * FROM chat_settings WHERE is_global = 1 ORDER BY updated_at DESC LIMIT 1"
                 )
-            else:
-                return None
 
             row = cursor.fetchone()
-            return dict(row) if row else None
+            result = dict(row) if row else None
+
+        self._cache_put(
+            self._settings_cache, cache_key, result, self._SETTINGS_CACHE_SIZE, generation
+        )
+        return result
 
     def get_all_chat_settings(
         self, limit: int = 100, offset: int = 0
     ) -> List[Dict[str, Any]]:
         """Get all chat settings with pagination"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        with self._connect() as conn:
+            cursor = self._tuple_cursor(conn).execute(
                 """
                 SELECT * FROM chat_settings
                 ORDER BY updated_at DESC
@@ -526,7 +795,7 @@ class ChatSQLiteCRUD:
                 (limit, offset),
             )
 
-            return [dict(row) for row in cursor.fetchall()]
+            return self._rows_as_dicts(cursor)
 
     def update_chat_settings(
         self,
@@ -544,41 +813,31 @@ class ChatSQLiteCRUD:
         is_global: Optional[bool] = None,
     ) -> bool:
         """Update chat settings by ID"""
-        update_fields = ["updated_at = ?"]
-        params = [datetime.now().timestamp()]
-
-        # Add fields that are not None
-        field_mapping = {
-            "system_prompt": system_prompt,
-            "user_name": user_name,
-            "model": model,
-            "prompt_template_id": prompt_template_id,
-            "top_p": top_p,
-            "top_k": top_k,
-            "document_analysis_mode": document_analysis_mode,
-            "enable_thinking": enable_thinking,
-            "max_previous_memory_retention": max_previous_memory_retention,
-            "chat_id": chat_id,
-            "is_global": is_global,
-        }
-
-        for field, value in field_mapping.items():
-            if value is not None:
-                update_fields.append(f"{field} = ?")
-                params.append(value)
-
-        params.append(settings_id)  # WHERE clause
-
-        query = f"""
-            UPDATE chat_settings
-            SET {', '.join(update_fields)}
-            WHERE id = ?
-        """
-
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
+        def update(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(
+                self._SQL_UPDATE_SETTINGS,
+                (
+                    system_prompt,
+                    user_name,
+                    model,
+                    prompt_template_id,
+                    top_p,
+                    top_k,
+                    document_analysis_mode,
+                    enable_thinking,
+                    max_previous_memory_retention,
+                    chat_id,
+                    is_global,
+                    time.time(),
+                    settings_id,
+                ),
+            )
             return cursor.rowcount > 0
 
+        updated = self._write(update)
+        self._invalidate_settings()
+        return updated
+
     def update_chat_settings_by_chat_id(
         self,
         chat_id: str,
@@ -594,55 +853,51 @@ class ChatSQLiteCRUD:
         is_global: Optional[bool] = None,
     ) -> bool:
         """Update chat settings by chat_id"""
-        update_fields = ["updated_at = ?"]
-        params = [datetime.now().timestamp()]
-
-        # Add fields that are not None
-        field_mapping = {
-            "system_prompt": system_prompt,
-            "user_name": user_name,
-            "model": model,
-            "prompt_template_id": prompt_template_id,
-            "top_p": top_p,
-            "top_k": top_k,
-            "document_analysis_mode": document_analysis_mode,
-            "enable_thinking": enable_thinking,
-            "max_previous_memory_retention": max_previous_memory_retention,
-            "is_global": is_global,
-        }
-
-        for field, value in field_mapping.items():
-            if value is not None:
-                update_fields.append(f"{field} = ?")
-                params.append(value)
-
-        params.append(chat_id)  # WHERE clause
-
-        query = f"""
-            UPDATE chat_settings
-            SET {', '.join(update_fields)}
-            WHERE chat_id = ?
-        """
-
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
+        def update(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(
+                self._SQL_UPDATE_SETTINGS_BY_CHAT_ID,
+                (
+                    system_prompt,
+                    user_name,
+                    model,
+                    prompt_template_id,
+                    top_p,
+                    top_k,
+                    document_analysis_mode,
+                    enable_thinking,
+                    max_previous_memory_retention,
+                    is_global,
+                    time.time(),
+                    chat_id,
+                ),
+            )
             return cursor.rowcount > 0
 
+        updated = self._write(update)
+        self._invalidate_settings()
+        return updated
+
     def delete_chat_settings(self, settings_id: int) -> bool:
         """Delete chat settings by ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM chat_settings WHERE id = ?", (settings_id,)
+        def delete(conn: sqlite3.Connection) -> bool:
+            return self._execute_delete(
+                conn, "DELETE FROM chat_settings WHERE id = ?", (settings_id,)
             )
-            return cursor.rowcount > 0
+
+        deleted = self._write(delete)
+        self._invalidate_settings()
+        return deleted
 
     def delete_chat_settings_by_chat_id(self, chat_id: str) -> bool:
         """Delete chat settings by chat_id"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM chat_settings WHERE chat_id = ?", (chat_id,)
+        def delete(conn: sqlite3.Connection) -> bool:
+            return self._execute_delete(
+                conn, "DELETE FROM chat_settings WHERE chat_id = ?", (chat_id,)
             )
-            return cursor.rowcount > 0
+
+        deleted = self._write(delete)
+        self._invalidate_settings()
+        return deleted
 
     def get_global_settings(self) -> Optional[Dict[str, Any]]:
         """Get global chat settings"""
@@ -661,6 +916,51 @@ class ChatSQLiteCRUD:
         max_previous_memory_retention: int = 5,
     ) -> int:
         """Create or update global settings"""
+        if _SQLITE_HAS_RETURNING:
+            timestamp = time.time()
+
+            def upsert(conn: sqlite3.Connection) -> int:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO chat_settings (
+                        system_prompt, user_name, model, prompt_template_id,
+                        top_p, top_k, document_analysis_mode, enable_thinking,
+                        max_previous_memory_retention, chat_id, is_global,
+                        created_at, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, 1, ?, ?)
+                    ON CONFLICT(is_global) WHERE is_global = 1 DO UPDATE SET
+                        system_prompt = COALESCE(excluded.system_prompt, system_prompt),
+                        user_name = COALESCE(excluded.user_name, user_name),
+                        model = excluded.model,
+                        prompt_template_id = COALESCE(excluded.prompt_template_id, prompt_template_id),
+                        top_p = excluded.top_p,
+                        top_k = excluded.top_k,
+                        document_analysis_mode = excluded.document_analysis_mode,
+                        enable_thinking = excluded.enable_thinking,
+                        max_previous_memory_retention = excluded.max_previous_memory_retention,
+                        updated_at = excluded.updated_at
+                    RETURNING id
+                """,
+                    (
+                        system_prompt,
+                        user_name,
+                        model,
+                        prompt_template_id,
+                        top_p,
+                        top_k,
+                        document_analysis_mode,
+                        enable_thinking,
+                        max_previous_memory_retention,
+                        timestamp,
+                        timestamp,
+                    ),
+                )
+                return cursor.fetchone()[0]
+
+            settings_id = self._write(upsert)
+            self._invalidate_settings()
+            return settings_id
+
         existing = self.get_global_settings()
 
         if existing:
@@ -710,10 +1010,10 @@ class ChatSQLiteCRUD:
             session_id: The UUID of the created session
         """
         session_id = str(uuid.uuid4())
-        timestamp = datetime.now().timestamp()
-        metadata_json = json.dumps(metadata) if metadata else None
+        timestamp = time.time()
+        metadata_json = _dump_json(metadata) if metadata else None
 
-        with sqlite3.connect(self.db_path) as conn:
+        def insert(conn: sqlite3.Connection) -> None:
             conn.execute(
                 """
                 INSERT INTO chat_sessions (
@@ -723,31 +1023,43 @@ class ChatSQLiteCRUD:
                 (session_id, title, timestamp, timestamp, metadata_json),
             )
 
+        self._write(insert)
         return session_id
 
     def get_session_by_id(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get a session by its session_id"""
-        with sqlite3.connect(self.db_path) as conn:
+        cached = self._cache_get(self._session_cache, session_id)
+        if cached is not _CACHE_MISS:
+            return self._with_pending_touch(cached)
+        generation = self._cache_miss_generation(self._session_cache)
+
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 "SELECT * FROM chat_sessions WHERE session_id = ?", (session_id,)
             )
             row = cursor.fetchone()
 
-            if row:
-                result = dict(row)
-                if result["metadata"]:
-                    result["metadata"] = json.loads(result["metadata"])
-                return result
-            return None
+            if not row:
+                return None
+
+            result = dict(row)
+            if result["metadata"]:
+                result["metadata"] = json.loads(result["metadata"])
+
+        self._cache_put(
+            self._session_cache, session_id, result, self._SESSION_CACHE_SIZE, generation
+        )
+        return self._with_pending_touch(result)
 
     def get_all_sessions(
         self, limit: int = 100, offset: int = 0
     ) -> List[Dict[str, Any]]:
         """Get all chat sessions with pagination"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        # ORDER BY updated_at needs the buffered touches in the table
+        self.flush_session_touches()
+        with self._connect() as conn:
+            cursor = self._tuple_cursor(conn).execute(
                 """
                 SELECT * FROM chat_sessions
                 ORDER BY updated_at DESC
@@ -757,8 +1069,7 @@ class ChatSQLiteCRUD:
             )
 
             results = []
-            for row in cursor.fetchall():
-                result = dict(row)
+            for result in self._rows_as_dicts(cursor):
                 if result["metadata"]:
                     result["metadata"] = json.loads(result["metadata"])
                 results.append(result)
@@ -767,48 +1078,122 @@ class ChatSQLiteCRUD:
 
     def update_session_title(self, session_id: str, title: str) -> bool:
         """Update the title of a session"""
-        with sqlite3.connect(self.db_path) as conn:
+        def update(conn: sqlite3.Connection) -> bool:
             cursor = conn.execute(
                 """
                 UPDATE chat_sessions
                 SET title = ?, updated_at = ?
                 WHERE session_id = ?
             """,
-                (title, datetime.now().timestamp(), session_id),
+                (title, time.time(), session_id),
             )
             return cursor.rowcount > 0
 
+        updated = self._write(update)
+        self._invalidate_session(session_id)
+        return updated
+
     def update_session_updated_at(self, session_id: str) -> bool:
-        """Update the updated_at timestamp of a session"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                UPDATE chat_sessions
-                SET updated_at = ?
-                WHERE session_id = ?
-            """,
-                (datetime.now().timestamp(), session_id),
+        """
+        Update the updated_at timestamp of a session
+
+        The timestamp is buffered in memory and written together with other
+        pending touches (see flush_session_touches). Returns False, without
+        buffering anything, if the session does not exist.
+        """
+        if not self._session_exists(session_id):
+            return False
+
+        with self._touch_lock:
+            self._session_touch[session_id] = time.time()
+            flush_now = len(self._session_touch) >= self._SESSION_TOUCH_FLUSH_COUNT
+            if not flush_now and self._touch_timer is None:
+                self._touch_timer = threading.Timer(
+                    self._SESSION_TOUCH_FLUSH_INTERVAL, self.flush_session_touches
+                )
+                self._touch_timer.daemon = True
+                self._touch_timer.start()
+
+        if flush_now:
+            self.flush_session_touches()
+        return True
+
+    def flush_session_touches(self) -> int:
+        """Write all buffered session timestamps in one transaction, returns the count"""
+        with self._touch_lock:
+            if self._touch_timer is not None:
+                self._touch_timer.cancel()
+                self._touch_timer = None
+            if not self._session_touch:
+                return 0
+            pending = dict(self._session_touch)
+
+        # MAX() so a touch never moves back a newer updated_at set by another write
+        self._write(
+            lambda conn: conn.executemany(
+                "UPDATE chat_sessions SET updated_at = MAX(COALESCE(updated_at, 0), ?) WHERE session_id = ?",
+                [(updated_at, session_id) for session_id, updated_at in pending.items()],
+            )
+        )
+        for session_id in pending:
+            self._invalidate_session(session_id)
+        # Only now drop the flushed touches, so get_session_by_id overlays them
+        # until the table has them; newer touches made meanwhile stay buffered
+        with self._touch_lock:
+            for session_id, updated_at in pending.items():
+                if self._session_touch.get(session_id) == updated_at:
+                    del self._session_touch[session_id]
+        return len(pending)
+
+    def _with_pending_touch(
+        self, session: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Apply a buffered, not yet flushed touch to a session row"""
+        if session is None:
+            return None
+        with self._touch_lock:
+            touched = self._session_touch.get(session["session_id"])
+        if touched is not None and touched > (session["updated_at"] or 0):
+            session["updated_at"] = touched
+        return session
+
+    def _session_exists(self, session_id: str) -> bool:
+        """Check the session cache, then the table, for a session_id"""
+        with self._cache_lock:
+            if session_id in self._session_cache:
+                return True
+        with self._connect() as conn:
+            return (
+                conn.execute(
+                    "SELECT 1 FROM chat_sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                is not None
             )
-            return cursor.rowcount > 0
 
     def delete_session(self, session_id: str) -> bool:
         """Delete a session and all its associated chat entries"""
-        with sqlite3.connect(self.db_path) as conn:
-            # Delete all chat entries for this session
-            conn.execute("DELETE FROM chat_history WHERE session_id = ?", (session_id,))
+        def delete(conn: sqlite3.Connection) -> bool:
+            if not self._session_fk:
+                # No ON DELETE CASCADE on this database: delete the chat entries
+                # ourselves, in the same transaction as the session row
+                conn.execute(
+                    "DELETE FROM chat_history WHERE session_id = ?", (session_id,)
+                )
             # Delete the session
-            cursor = conn.execute(
-                "DELETE FROM chat_sessions WHERE session_id = ?", (session_id,)
+            return self._execute_delete(
+                conn, "DELETE FROM chat_sessions WHERE session_id = ?", (session_id,)
             )
-            return cursor.rowcount > 0
+
+        deleted = self._write(delete)
+        self._invalidate_session(session_id)
+        return deleted
 
     def get_session_messages(
         self, session_id: str, limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Get all messages in a session"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        with self._connect() as conn:
+            cursor = self._tuple_cursor(conn).execute(
                 """
                 SELECT * FROM chat_history
                 WHERE session_id = ?
@@ -819,8 +1204,7 @@ class ChatSQLiteCRUD:
             )
 
             results = []
-            for row in cursor.fetchall():
-                result = dict(row)
+            for result in self._rows_as_dicts(cursor):
                 if result["metadata"]:
                     result["metadata"] = json.loads(result["metadata"])
                 results.append(result)
@@ -831,9 +1215,38 @@ class ChatSQLiteCRUD:
         self, session_id: str, max_chars: int = 1000, max_messages: int = 10
     ) -> List[Dict[str, Any]]:
         """Get last N messages for context (up to max_chars)"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        with self._connect() as conn:
+            if _SQLITE_HAS_WINDOW:
+                # Running character total from the newest message backwards; the
+                # budget cutoff and the chronological ordering both happen in SQL
+                cursor = self._tuple_cursor(conn).execute(
+                    """
+                    SELECT * FROM (
+                        SELECT *, SUM(length(prompt) + length(response)) OVER (
+                            ORDER BY created_at DESC
+                            ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                        ) AS context_chars
+                        FROM chat_history
+                        WHERE session_id = ?
+                        ORDER BY created_at DESC
+                        LIMIT ?
+                    )
+                    WHERE context_chars <= ?
+                    ORDER BY created_at ASC
+                """,
+                    (session_id, max_messages, max_chars),
+                )
+
+                results = []
+                for result in self._rows_as_dicts(cursor):
+                    del result["context_chars"]
+                    if result["metadata"]:
+                        result["metadata"] = json.loads(result["metadata"])
+                    results.append(result)
+
+                return results
+
+            cursor = self._tuple_cursor(conn).execute(
                 """
                 SELECT * FROM chat_history
                 WHERE session_id = ?
@@ -846,8 +1259,7 @@ class ChatSQLiteCRUD:
             results = []
             total_chars = 0
 
-            for row in cursor.fetchall():
-                result = dict(row)
+            for result in self._rows_as_dicts(cursor):
                 if result["metadata"]:
                     result["metadata"] = json.loads(result["metadata"])
 
@@ -869,9 +1281,8 @@ class ChatSQLiteCRUD:
         self, session_id: str, limit: int = 100, offset: int = 0
     ) -> List[Dict[str, Any]]:
         """Get chat entries by session_id with pagination"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        with self._connect() as conn:
+            cursor = self._tuple_cursor(conn).execute(
                 """
                 SELECT * FROM chat_history
                 WHERE session_id = ?
@@ -882,8 +1293,7 @@ class ChatSQLiteCRUD:
             )
 
             results = []
-            for row in cursor.fetchall():
-                result = dict(row)
+            for result in self._rows_as_dicts(cursor):
                 if result["metadata"]:
                     result["metadata"] = json.loads(result["metadata"])
                 results.append(result)
@@ -892,7 +1302,7 @@ class ChatSQLiteCRUD:
 
     def get_session_stats(self, session_id: str) -> Dict[str, Any]:
         """Get statistics for a session"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 """
                 SELECT
@@ -942,9 +1352,9 @@ class ChatSQLiteCRUD:
         # Auto-generate title from query (first 60 chars)
         title = query[:60] + "..." if len(query) > 60 else query
 
-        tags_json = json.dumps(tags) if tags else None
+        tags_json = _dump_json(tags) if tags else None
 
-        with sqlite3.connect(self.db_path) as conn:
+        def insert(conn: sqlite3.Connection) -> None:
             conn.execute(
                 """
                 INSERT INTO research_sessions (
@@ -964,11 +1374,12 @@ class ChatSQLiteCRUD:
                 ),
             )
 
+        self._write(insert)
         return slug
 
     def get_research_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
         """Get a research session by its slug"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 "SELECT * FROM research_sessions WHERE slug = ?", (slug,)
@@ -1002,11 +1413,9 @@ class ChatSQLiteCRUD:
         Returns:
             List of research session dictionaries
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-
+        with self._connect() as conn:
             if status:
-                cursor = conn.execute(
+                cursor = self._tuple_cursor(conn).execute(
                     """
                     SELECT * FROM research_sessions
                     WHERE status = ?
@@ -1016,7 +1425,7 @@ class ChatSQLiteCRUD:
                     (status, limit, offset),
                 )
             else:
-                cursor = conn.execute(
+                cursor = self._tuple_cursor(conn).execute(
                     """
                     SELECT * FROM research_sessions
                     ORDER BY created_at DESC
@@ -1026,8 +1435,7 @@ class ChatSQLiteCRUD:
                 )
 
             results = []
-            for row in cursor.fetchall():
-                result = dict(row)
+            for result in self._rows_as_dicts(cursor):
                 # Parse JSON fields
                 if result["resources_used"]:
                     result["resources_used"] = json.loads(result["resources_used"])
@@ -1066,61 +1474,58 @@ class ChatSQLiteCRUD:
         timestamp = now.timestamp()
         datetime_end = now.isoformat()
 
-        update_fields = ["status = ?", "datetime_end = ?", "updated_at = ?"]
+        update_fields = ["status", "datetime_end", "updated_at"]
         params = [status, datetime_end, timestamp]
 
         if duration is not None:
-            update_fields.append("duration = ?")
+            update_fields.append("duration")
             params.append(duration)
 
         if answer is not None:
-            update_fields.append("answer = ?")
+            update_fields.append("answer")
             params.append(answer)
 
         if resources_used is not None:
-            update_fields.append("resources_used = ?")
-            params.append(json.dumps(resources_used))
+            update_fields.append("resources_used")
+            params.append(_dump_json(resources_used))
 
         if metadata is not None:
-            update_fields.append("metadata = ?")
-            params.append(json.dumps(metadata))
+            update_fields.append("metadata")
+            params.append(_dump_json(metadata))
 
         params.append(slug)  # WHERE clause
 
-        query = f"""
-            UPDATE research_sessions
-            SET {', '.join(update_fields)}
-            WHERE slug = ?
-        """
+        query = _build_update_sql("research_sessions", tuple(update_fields), "slug")
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            return cursor.rowcount > 0
+        return self._write(lambda conn: conn.execute(query, params).rowcount > 0)
 
     def update_research_title(self, slug: str, title: str) -> bool:
         """Update research session title"""
-        with sqlite3.connect(self.db_path) as conn:
+        def update(conn: sqlite3.Connection) -> bool:
             cursor = conn.execute(
                 """
                 UPDATE research_sessions
                 SET title = ?, updated_at = ?
                 WHERE slug = ?
             """,
-                (title, datetime.now().timestamp(), slug),
+                (title, time.time(), slug),
             )
             return cursor.rowcount > 0
 
+        return self._write(update)
+
     def delete_research(self, slug: str) -> bool:
         """Delete a research session by slug"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM research_sessions WHERE slug = ?", (slug,)
+        def delete(conn: sqlite3.Connection) -> bool:
+            return self._execute_delete(
+                conn, "DELETE FROM research_sessions WHERE slug = ?", (slug,)
             )
-            return cursor.rowcount > 0
+
+        return self._write(delete)
 
     def get_research_stats(self) -> Dict[str, Any]:
         """Get statistics about research sessions"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 """
                 SELECT
@@ -1152,9 +1557,8 @@ class ChatSQLiteCRUD:
         """Search research sessions by query, title, or answer content"""
         search_pattern = f"%{query}%"
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        with self._connect() as conn:
+            cursor = self._tuple_cursor(conn).execute(
                 """
                 SELECT * FROM research_sessions
                 WHERE query LIKE ? OR title LIKE ? OR answer LIKE ?
@@ -1165,8 +1569,7 @@ class ChatSQLiteCRUD:
             )
 
             results = []
-            for row in cursor.fetchall():
-                result = dict(row)
+            for result in self._rows_as_dicts(cursor):
                 # Parse JSON fields
                 if result["resources_used"]:
                     result["resources_used"] = json.loads(result["resources_used"])
@@ -1,18 +1,38 @@
+import io
+import csv
 import os
 import re
 import json
 import time
+import calendar
+import atexit
 import hashlib
 import sqlite3
-import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Iterator, Callable
 import pypandoc
 import pandas as pd
 
 from markdown_pdf import MarkdownPdf, Section
 
+try:
+    import xlsxwriter
+
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Basic Variables
 DATABASE_URL = "exporter.sqlite3"
 OUTPUT_DIR = "D:\\Commercial\\pixelThreader\\DeepResearcher\\app\\deep-researcher-v0-fb\\deep-researcher-backend-beta\\bucket\\_generated\\docs"
@@ -20,47 +40,148 @@ SALT_SECRET = os.getenv(
     "EXPORTER_SALT_SECRET",
     hashlib.sha256(f"{os.getpid()}-{time.time_ns()}-{os.urandom(16).hex()}".encode()).hexdigest(),
 )
+SALT_BYTES = SALT_SECRET.encode()
+_HASH_CHUNK = 1 << 20  # read size for file checksums
+
+# OUTPUT_DIR never changes at runtime, so resolve it once
+_OUTPUT_ROOT = os.path.abspath(OUTPUT_DIR)
+# normcase folds case only where the filesystem does (Windows), so the prefix check is exact on POSIX
+_OUTPUT_ROOT_NORM = os.path.normcase(_OUTPUT_ROOT) + os.sep
+
+_SLUG_BAD = re.compile(r"[^a-z0-9\-_. ]+")
+_SLUG_WS = re.compile(r"[\s_]+")
+_SLUG_DASH = re.compile(r"-+")
 
 # --------------------------------------
 # Utilities
 # --------------------------------------
 
+@lru_cache(maxsize=1)
 def ensure_output_dir() -> None:
+    # Only the first call per process reaches os.makedirs
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
+def _dump_json(value: Any) -> str:
+    """Serialize metadata_json, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
 def utc_now_iso() -> str:
-    return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+    # Same "YYYY-MM-DDTHH:MM:SSZ" shape as before, without building a datetime
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
 def slugify(value: str) -> str:
     if not value:
         return "export"
     value = value.strip().lower()
-    value = re.sub(r"[^a-z0-9\-_. ]+", "-", value)
-    value = re.sub(r"[\s_]+", "-", value)
-    value = re.sub(r"-+", "-", value).strip("-")
+    value = _SLUG_BAD.sub("-", value)
+    value = _SLUG_WS.sub("-", value)
+    value = _SLUG_DASH.sub("-", value).strip("-")
     return value or "export"
 
 
-def compute_sha256(file_path: str) -> Optional[str]:
+def compute_size_and_sha256(file_path: str) -> Tuple[Optional[int], Optional[str]]:
+    """Size and SHA-256 of a file from a single read pass; (None, None) if it can't be read."""
     try:
         sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        size = 0
+        # Reuse one 1 MiB buffer: fewer read syscalls and no per-chunk bytes allocation
+        buf = bytearray(_HASH_CHUNK)
+        view = memoryview(buf)
+        with open(file_path, "rb", buffering=0) as f:
+            while n := f.readinto(buf):
+                sha256.update(view[:n])
+                size += n
+        return size, sha256.hexdigest()
     except Exception:
+        return None, None
+
+
+@lru_cache(maxsize=256)
+def _cached_sha256(file_path: str, mtime_ns: int, size: int) -> Optional[str]:
+    return compute_size_and_sha256(file_path)[1]
+
+
+def compute_sha256(file_path: str) -> Optional[str]:
+    """
+    SHA-256 of a file, memoized on (path, mtime, size) so re-hashing an unchanged file
+    (e.g. the same input markdown across runs) is a stat instead of a full read.
+    Freshly written outputs go through compute_size_and_sha256 directly; PDF exports use this
+    for the input markdown and keep it in metadata_json as input_sha256.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
         return None
+    return _cached_sha256(os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+
+
+class HashingWriter:
+    """Binary file writer that checksums and counts bytes as they are written."""
+
+    def __init__(self, file_path: str):
+        self._f = open(file_path, "wb")
+        self._sha256 = hashlib.sha256()
+        self.bytes_size = 0
+
+    def write(self, data: bytes) -> int:
+        self._sha256.update(data)
+        self.bytes_size += len(data)
+        return self._f.write(data)
+
+    @property
+    def checksum(self) -> str:
+        return self._sha256.hexdigest()
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "HashingWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def write_xlsx(df: pd.DataFrame, output_path: str) -> None:
+    """Write a DataFrame to XLSX, streaming rows with xlsxwriter's constant_memory mode when installed."""
+    if not XLSXWRITER_AVAILABLE:
+        df.to_excel(output_path, index=False)
+        return
+    # constant_memory flushes each row once a later row is written, so rows must be written
+    # top to bottom; df.to_excel writes column by column and would lose cells in this mode
+    workbook = xlsxwriter.Workbook(output_path, {"constant_memory": True})
+    try:
+        worksheet = workbook.add_worksheet("Sheet1")
+        worksheet.write_row(0, 0, [str(col) for col in df.columns])
+        for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+            # NaN cells stay blank, as with to_excel's default na_rep
+            worksheet.write_row(row_idx, 0, [None if pd.isna(value) else value for value in row])
+    finally:
+        workbook.close()
+
+
+def count_csv_table(csv_text: str) -> Tuple[int, int]:
+    """Row (excluding header) and column counts of CSV text, without building a DataFrame."""
+    # csv.reader keeps quoted commas/newlines inside one field; blank lines are skipped like read_csv does
+    rows = csv.reader(io.StringIO(csv_text))
+    header = next((row for row in rows if row), None)
+    if header is None:
+        return 0, 0
+    return sum(1 for row in rows if row), len(header)
 
 
 def build_output_path(base_name: str, ext: str) -> str:
     ensure_output_dir()
     safe = slugify(base_name)
-    ts = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+    ts = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
     rand = os.urandom(3).hex()  # 6 hex chars, reduces collision within same second
     filename = f"{safe}-{ts}-{rand}.{ext}"
-    return os.path.join(OUTPUT_DIR, filename)
+    return os.path.join(_OUTPUT_ROOT, filename)
 
 
 def normalize_output_path(preferred_output_path: Optional[str], ext: str, base_name: str) -> str:
@@ -77,30 +198,159 @@ def normalize_output_path(preferred_output_path: Optional[str], ext: str, base_n
     if not abs_out.lower().endswith(f".{ext}"):
         abs_out = f"{abs_out}.{ext}"
 
-    output_root = os.path.abspath(OUTPUT_DIR)
     # Normalize to OUTPUT_DIR if outside
-    if not abs_out.lower().startswith(output_root.lower() + os.sep):
-        abs_out = os.path.join(output_root, os.path.basename(abs_out))
+    if not os.path.normcase(abs_out).startswith(_OUTPUT_ROOT_NORM):
+        abs_out = os.path.join(_OUTPUT_ROOT, os.path.basename(abs_out))
 
     os.makedirs(os.path.dirname(abs_out), exist_ok=True)
     return abs_out
 
 
+def _decode_text(data: bytes, encoding: str, errors: str = "strict") -> str:
+    # Match text-mode open(): universal newlines
+    text = data.decode(encoding, errors)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def read_markdown_file(file_path: str, encoding: str = "utf-8") -> Dict[str, Any]:
+    """
+    Safely read a markdown file with proper encoding handling
+    
+    Args:
+        file_path (str): Path to the markdown file
+        encoding (str): Encoding to try first. Defaults to utf-8.
+        
+    Returns:
+        Dict[str, Any]: Response containing success status, message and content if successful
+    """
+    try:
+        # Read the bytes once and decode in memory instead of re-opening per encoding
+        data = Path(file_path).read_bytes()
+
+        # A UTF-8 BOM decides the decoder up front
+        if data[:3] == b"\xef\xbb\xbf":
+            return {
+                "success": True,
+                "message": "File read successfully using utf-8-sig encoding",
+                "content": _decode_text(data, 'utf-8-sig')
+            }
+
+        try:
+            return {
+                "success": True,
+                "message": "File read successfully",
+                "content": _decode_text(data, encoding)
+            }
+        except UnicodeDecodeError:
+            # Last resort: replace unknown characters
+            return {
+                "success": True,
+                "message": "File read with some character replacements",
+                "content": _decode_text(data, encoding, errors='replace')
+            }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error reading file: {str(e)}",
+            "error": str(e)
+        }
+
+
 # --------------------------------------
 # SQLite helpers
 # --------------------------------------
 
+# Fixed statement text so each cached connection prepares these once
+_SQL_INSERT_START = """
+    INSERT INTO exports (created_at, updated_at, status, success, format, source_type, input_path, output_path)
+    VALUES (?, ?, 'started', 0, ?, ?, ?, ?)
+    """
+_SQL_UPDATE_SUCCESS = """
+    UPDATE exports
+    SET updated_at=?, status='success', success=1, message=?, bytes_size=?, rows=?, columns=?, duration_ms=?, checksum_sha256=?, unique_hash=?, metadata_json=?
+    WHERE id=?
+    """
+_SQL_UPDATE_FAILURE = """
+    UPDATE exports
+    SET updated_at=?, status='failure', success=0, message=?, error=?, duration_ms=?, metadata_json=?
+    WHERE id=?
+    """
+_SQL_SELECT_EXPORT = "SELECT * FROM exports WHERE id=?"
+_SQL_LIST_BASE = "SELECT * FROM exports"
+
+_tls = threading.local()
+_all_connections: List[sqlite3.Connection] = []
+_all_connections_lock = threading.Lock()
+_initialized_dbs: set = set()
+_db_init_lock = threading.Lock()
+# created_at of rows started via db_start_export*, popped by the finish helpers. Rows that are
+# never finished would otherwise stay forever, so only the newest _CREATED_AT_CACHE_MAX are
+# kept; finishing an evicted row reads created_at back from the table instead.
+_CREATED_AT_CACHE: "OrderedDict[int, str]" = OrderedDict()
+_CREATED_AT_CACHE_MAX = 1024
+_created_at_lock = threading.Lock()
+
+
+def _remember_created_at(export_ids: Iterable[int], created_at: str) -> None:
+    with _created_at_lock:
+        for export_id in export_ids:
+            _CREATED_AT_CACHE[export_id] = created_at
+        while len(_CREATED_AT_CACHE) > _CREATED_AT_CACHE_MAX:
+            _CREATED_AT_CACHE.popitem(last=False)
+
+
+def _pop_created_at(export_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[str]:
+    with _created_at_lock:
+        created_at = _CREATED_AT_CACHE.pop(export_id, None)
+    if created_at is None:
+        row = (conn or _connect()).execute("SELECT created_at FROM exports WHERE id=?", (export_id,)).fetchone()
+        created_at = row[0] if row else None
+    return created_at
+
+
 def _connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(DATABASE_URL)
-    conn.row_factory = sqlite3.Row
-    with conn:
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA foreign_keys=ON;")
+    """
+    Return this thread's cached connection, opening it (and running the PRAGMAs) on first use.
+    Callers use `with conn:` for the transaction only; the connection itself stays open.
+    """
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DATABASE_URL, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        with conn:
+            if DATABASE_URL != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL;")
+                # WAL only needs an fsync at checkpoints; NORMAL keeps it durable across app crashes
+                conn.execute("PRAGMA synchronous=NORMAL;")
+                conn.execute("PRAGMA mmap_size=268435456;")  # 256 MiB
+            conn.execute("PRAGMA temp_store=MEMORY;")
+            conn.execute("PRAGMA cache_size=-65536;")  # 64 MiB
+            conn.execute("PRAGMA busy_timeout=5000;")
+            conn.execute("PRAGMA foreign_keys=ON;")
+        _tls.conn = conn
+        with _all_connections_lock:
+            _all_connections.append(conn)
     return conn
 
 
+@atexit.register
+def _close_connections() -> None:
+    with _all_connections_lock:
+        for conn in _all_connections:
+            try:
+                # Let SQLite refresh planner statistics for the queries this process ran
+                conn.execute("PRAGMA optimize;")
+                conn.close()
+            except Exception:
+                pass
+        _all_connections.clear()
+
+
 def init_db() -> None:
-    with _connect() as conn:
+    conn = _connect()
+    with conn:
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS exports (
@@ -126,8 +376,13 @@ def init_db() -> None:
             """
         )
         conn.execute("CREATE INDEX IF NOT EXISTS idx_exports_created_at ON exports(created_at);")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_exports_format ON exports(format);")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_exports_status ON exports(status);")
+        # list_exports filters on format and/or status and orders by id DESC; these serve every
+        # combination without a sort step (and supersede the old single-column indexes)
+        conn.execute("DROP INDEX IF EXISTS idx_exports_format;")
+        conn.execute("DROP INDEX IF EXISTS idx_exports_status;")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_exports_format_id ON exports(format, id DESC);")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_exports_status_id ON exports(status, id DESC);")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_exports_format_status_id ON exports(format, status, id DESC);")
 
         # Ensure unique_hash exists if table created previously without it
         cols = {r[1] for r in conn.execute("PRAGMA table_info(exports)").fetchall()}
@@ -135,24 +390,81 @@ def init_db() -> None:
             conn.execute("ALTER TABLE exports ADD COLUMN unique_hash TEXT;")
 
 
+def _ensure_db() -> None:
+    """Run init_db once per process (per DATABASE_URL) rather than before every export."""
+    if DATABASE_URL in _initialized_dbs:
+        return
+    with _db_init_lock:
+        if DATABASE_URL not in _initialized_dbs:
+            init_db()
+            _initialized_dbs.add(DATABASE_URL)
+
+
+@contextmanager
+def _write_txn(conn: sqlite3.Connection) -> Iterator[None]:
+    """
+    BEGIN IMMEDIATE ... COMMIT around the block. If the connection is already inside a
+    transaction, use a savepoint instead so the outer one commits.
+    """
+    if conn.in_transaction:
+        conn.execute("SAVEPOINT export_write")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK TO export_write")
+            conn.execute("RELEASE export_write")
+            raise
+        conn.execute("RELEASE export_write")
+    else:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def _insert_started(
+    conn: sqlite3.Connection,
+    fmt: str,
+    source_type: str,
+    input_path: Optional[str],
+    output_path: str,
+    now: str,
+) -> int:
+    cur = conn.execute(_SQL_INSERT_START, (now, now, fmt, source_type, input_path, output_path))
+    return int(cur.lastrowid)
+
+
 def db_start_export(fmt: str, source_type: str, input_path: Optional[str], output_path: str) -> int:
-    init_db()
+    _ensure_db()
+    conn = _connect()
     now = utc_now_iso()
-    with _connect() as conn:
-        cur = conn.execute(
-            """
-            INSERT INTO exports (created_at, updated_at, status, success, format, source_type, input_path, output_path)
-            VALUES (?, ?, 'started', 0, ?, ?, ?, ?)
-            """,
-            (now, now, fmt, source_type, input_path, output_path),
-        )
-        return int(cur.lastrowid)
+    with conn:
+        export_id = _insert_started(conn, fmt, source_type, input_path, output_path, now)
+    _remember_created_at((export_id,), now)
+    return export_id
 
 
-def _get_created_at(export_id: int) -> Optional[str]:
-    with _connect() as conn:
-        row = conn.execute("SELECT created_at FROM exports WHERE id=?", (export_id,)).fetchone()
-        return row["created_at"] if row else None
+def db_start_export_many(rows: Iterable[Tuple[str, str, Optional[str], str]]) -> List[int]:
+    """
+    Insert several 'started' rows with one executemany in a single transaction.
+    rows are (fmt, source_type, input_path, output_path); returns the new ids in the same order.
+    """
+    _ensure_db()
+    now = utc_now_iso()
+    params = [(now, now, fmt, source_type, input_path, output_path) for fmt, source_type, input_path, output_path in rows]
+    if not params:
+        return []
+    conn = _connect()
+    with _write_txn(conn):
+        conn.executemany(_SQL_INSERT_START, params)
+        # The write lock is held for the whole statement, so AUTOINCREMENT ids are consecutive
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    ids = list(range(last_id - len(params) + 1, last_id + 1))
+    _remember_created_at(ids, now)
+    return ids
 
 
 def compute_unique_hash(
@@ -168,17 +480,24 @@ def compute_unique_hash(
     """
     if nonce is None:
         nonce = os.urandom(16).hex()
-    parts = [
-        "v1",
-        SALT_SECRET,
-        str(export_id),
-        created_at_iso or "",
-        output_path or "",
-        base_checksum or "",
-        nonce,
-    ]
-    h = hashlib.sha256("|".join(parts).encode()).hexdigest()
-    return h
+    # Feed the parts straight into the hasher; the digest matches sha256("|".join(parts))
+    h = hashlib.sha256(b"v1|")
+    h.update(SALT_BYTES)
+    for part in (str(export_id), created_at_iso or "", output_path or "", base_checksum or "", nonce):
+        h.update(b"|")
+        h.update(part.encode())
+    return h.hexdigest()
+
+
+def _duration_since_iso(created_at: Optional[str]) -> Optional[int]:
+    # Fallback for callers without a monotonic start time (second resolution only)
+    if not created_at:
+        return None
+    try:
+        started = calendar.timegm(time.strptime(created_at, "%Y-%m-%dT%H:%M:%SZ"))
+        return int((time.time() - started) * 1000)
+    except Exception:
+        return None
 
 
 def db_finish_success(
@@ -188,40 +507,52 @@ def db_finish_success(
     rows: Optional[int] = None,
     columns: Optional[int] = None,
     metadata: Optional[Dict[str, Any]] = None,
-) -> None:
+    created_at: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    bytes_size: Optional[int] = None,
+    checksum: Optional[str] = None,
+    duration_ms: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Mark an export as successful and return the computed fields that were stored.
+    created_at (passed, or remembered from db_start_export / read back) is used for the unique hash, and for duration_ms unless it is passed.
+    If conn is given, the UPDATE joins that connection's open transaction instead of committing.
+    bytes_size/checksum may be passed by writers that already know them; otherwise the output is read once.
+    """
     now = utc_now_iso()
-    bytes_size = os.path.getsize(output_path) if os.path.exists(output_path) else None
-    checksum = compute_sha256(output_path) if os.path.exists(output_path) else None
-    created_at = _get_created_at(export_id)
-    duration_ms = None
-    if created_at:
-        try:
-            started = datetime.fromisoformat(created_at.replace("Z", ""))
-            duration_ms = int((datetime.utcnow() - started).total_seconds() * 1000)
-        except Exception:
-            duration_ms = None
+    if created_at is None:
+        created_at = _pop_created_at(export_id, conn)
+    if bytes_size is None or checksum is None:
+        bytes_size, checksum = compute_size_and_sha256(output_path)
+    if duration_ms is None:
+        duration_ms = _duration_since_iso(created_at)
     # salted unique hash to guarantee uniqueness per export
     unique_h = compute_unique_hash(checksum, output_path, export_id, created_at)
-    with _connect() as conn:
-        conn.execute(
-            """
-            UPDATE exports
-            SET updated_at=?, status='success', success=1, message=?, bytes_size=?, rows=?, columns=?, duration_ms=?, checksum_sha256=?, unique_hash=?, metadata_json=?
-            WHERE id=?
-            """,
-            (
-                now,
-                message,
-                bytes_size,
-                rows,
-                columns,
-                duration_ms,
-                checksum,
-                unique_h,
-                json.dumps(metadata) if metadata else None,
-                export_id,
-            ),
-        )
+    params = (
+        now,
+        message,
+        bytes_size,
+        rows,
+        columns,
+        duration_ms,
+        checksum,
+        unique_h,
+        _dump_json(metadata) if metadata else None,
+        export_id,
+    )
+    if conn is not None:
+        conn.execute(_SQL_UPDATE_SUCCESS, params)
+    else:
+        conn = _connect()
+        with conn:
+            conn.execute(_SQL_UPDATE_SUCCESS, params)
+    return {
+        "bytes_size": bytes_size,
+        "rows": rows,
+        "columns": columns,
+        "duration_ms": duration_ms,
+        "checksum_sha256": checksum,
+    }
 
 
 def db_finish_failure(
@@ -230,42 +561,41 @@ def db_finish_failure(
     message: str,
     error: str,
     metadata: Optional[Dict[str, Any]] = None,
+    created_at: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    duration_ms: Optional[int] = None,
 ) -> None:
+    """Mark an export as failed; created_at, conn and duration_ms behave as in db_finish_success."""
     now = utc_now_iso()
-    created_at = _get_created_at(export_id)
-    duration_ms = None
-    if created_at:
-        try:
-            started = datetime.fromisoformat(created_at.replace("Z", ""))
-            duration_ms = int((datetime.utcnow() - started).total_seconds() * 1000)
-        except Exception:
-            duration_ms = None
-    with _connect() as conn:
-        conn.execute(
-            """
-            UPDATE exports
-            SET updated_at=?, status='failure', success=0, message=?, error=?, duration_ms=?, metadata_json=?
-            WHERE id=?
-            """,
-            (
-                now,
-                message,
-                error,
-                duration_ms,
-                json.dumps(metadata) if metadata else None,
-                export_id,
-            ),
-        )
+    if created_at is None:
+        created_at = _pop_created_at(export_id, conn)
+    if duration_ms is None:
+        duration_ms = _duration_since_iso(created_at)
+    params = (
+        now,
+        message,
+        error,
+        duration_ms,
+        _dump_json(metadata) if metadata else None,
+        export_id,
+    )
+    if conn is not None:
+        conn.execute(_SQL_UPDATE_FAILURE, params)
+        return
+    conn = _connect()
+    with conn:
+        conn.execute(_SQL_UPDATE_FAILURE, params)
 
 
 def get_export(export_id: int) -> Optional[Dict[str, Any]]:
-    with _connect() as conn:
-        row = conn.execute("SELECT * FROM exports WHERE id=?", (export_id,)).fetchone()
+    conn = _connect()
+    with conn:
+        row = conn.execute(_SQL_SELECT_EXPORT, (export_id,)).fetchone()
         return dict(row) if row else None
 
 
 def list_exports(fmt: Optional[str] = None, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
-    sql = "SELECT * FROM exports"
+    sql = _SQL_LIST_BASE
     clauses = []
     params: List[Any] = []
     if fmt:
@@ -278,11 +608,71 @@ def list_exports(fmt: Optional[str] = None, status: Optional[str] = None, limit:
         sql += " WHERE " + " AND ".join(clauses)
     sql += " ORDER BY id DESC LIMIT ?"
     params.append(limit)
-    with _connect() as conn:
+    conn = _connect()
+    with conn:
         rows = conn.execute(sql, tuple(params)).fetchall()
         return [dict(r) for r in rows]
 
 
+class ExportTxn:
+    """
+    DB bookkeeping for a single export. Nothing is written while the file is produced; record()
+    opens BEGIN IMMEDIATE, inserts the 'started' row and runs the caller's final-status write on
+    the same connection, committing (or rolling back) both together. Inside BaseExporter.bulk,
+    record() only queues that work and bulk writes the whole queue in one short transaction.
+    created_at stays in memory, so it never has to be read back.
+    """
+
+    def __init__(self, fmt: str, source_type: str, input_path: Optional[str], output_path: str):
+        self.fmt = fmt
+        self.source_type = source_type
+        self.input_path = input_path
+        self.output_path = output_path
+        self.created_at = utc_now_iso()
+        # Monotonic start for duration_ms: immune to wall-clock changes, no ISO round-trip
+        self.start_ns = time.monotonic_ns()
+        self.export_id: Optional[int] = None
+        self.conn: Optional[sqlite3.Connection] = None
+        self._txn = None
+
+    def __enter__(self) -> "ExportTxn":
+        _ensure_db()
+        self.conn = _connect()
+        self._txn = _write_txn(self.conn)
+        self._txn.__enter__()
+        try:
+            self.export_id = _insert_started(
+                self.conn, self.fmt, self.source_type, self.input_path, self.output_path, self.created_at
+            )
+        except BaseException as e:
+            self._txn.__exit__(type(e), e, e.__traceback__)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._txn.__exit__(exc_type, exc, tb)
+
+    def elapsed_ms(self) -> int:
+        return (time.monotonic_ns() - self.start_ns) // 1_000_000
+
+    def record(self, finish: Callable[[sqlite3.Connection, int], None]) -> None:
+        """Insert the 'started' row and call finish(conn, export_id) in one transaction (queued inside bulk)."""
+        batch = getattr(_tls, "bulk_batch", None)
+        if batch is not None:
+            batch.append((self, finish))
+            return
+        with self:
+            finish(self.conn, self.export_id)
+
+    def _write_queued(self, conn: sqlite3.Connection, finish: Callable[[sqlite3.Connection, int], None]) -> None:
+        # Used by BaseExporter.bulk inside its already-open transaction
+        self.conn = conn
+        self.export_id = _insert_started(
+            conn, self.fmt, self.source_type, self.input_path, self.output_path, self.created_at
+        )
+        finish(conn, self.export_id)
+
+
 # --------------------------------------
 # Base exporter mixin
 # --------------------------------------
@@ -291,37 +681,89 @@ class BaseExporter:
     def _resolve_out(self, preferred_output_path: Optional[str], ext: str, base_name: str) -> str:
         return normalize_output_path(preferred_output_path, ext, base_name)
 
-    def _start(self, fmt: str, source_type: str, input_path: Optional[str], output_path: str) -> int:
-        return db_start_export(fmt, source_type, input_path, output_path)
-
-    def _success(self, export_id: int, output_path: str, message: str, rows: Optional[int] = None, columns: Optional[int] = None, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        db_finish_success(export_id, output_path, message, rows, columns, metadata)
+    def bulk(self, ops: Iterable[Callable[[], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Run several exports (zero-argument callables, e.g. lambdas over convert_* methods) and
+        commit all of their DB records in one BEGIN IMMEDIATE ... COMMIT instead of one per export.
+        The conversions run first with no lock held; their records are queued and written together
+        afterwards, and each result's export_id is filled in at that point.
+        If an op raises, nothing from the batch is recorded.
+        """
+        if getattr(_tls, "bulk_batch", None) is not None:
+            raise RuntimeError("BaseExporter.bulk() cannot be nested")
+        _ensure_db()
+        batch: List[Tuple[ExportTxn, Callable[[sqlite3.Connection, int], None]]] = []
+        _tls.bulk_batch = batch
+        try:
+            results = [op() for op in ops]
+        finally:
+            _tls.bulk_batch = None
+        if batch:
+            conn = _connect()
+            with _write_txn(conn):
+                for txn, finish in batch:
+                    txn._write_queued(conn, finish)
+        return results
+
+    def _start(self, fmt: str, source_type: str, input_path: Optional[str], output_path: str) -> ExportTxn:
+        return ExportTxn(fmt, source_type, input_path, output_path)
+
+    def _success(self, txn: ExportTxn, output_path: str, message: str, rows: Optional[int] = None, columns: Optional[int] = None, metadata: Optional[Dict[str, Any]] = None, bytes_size: Optional[int] = None, checksum: Optional[str] = None) -> Dict[str, Any]:
+        duration_ms = txn.elapsed_ms()
+        # Read the output before any write lock is taken
+        if bytes_size is None or checksum is None:
+            bytes_size, checksum = compute_size_and_sha256(output_path)
         result: Dict[str, Any] = {
             "success": True,
             "status": "success",
-            "export_id": export_id,
+            "export_id": txn.export_id,
             "message": message,
             "output_file": output_path,
         }
-        # Enrich with computed fields from DB
-        exp = get_export(export_id)
-        if exp:
-            for k in ("bytes_size", "rows", "columns", "duration_ms", "checksum_sha256"):
-                if exp.get(k) is not None:
-                    result[k] = exp[k]
+        # Enrich with the computed fields that will be stored
+        stored = {
+            "bytes_size": bytes_size,
+            "rows": rows,
+            "columns": columns,
+            "duration_ms": duration_ms,
+            "checksum_sha256": checksum,
+        }
+        for k, v in stored.items():
+            if v is not None:
+                result[k] = v
+
+        def finish(conn: sqlite3.Connection, export_id: int) -> None:
+            db_finish_success(
+                export_id, output_path, message, rows, columns, metadata,
+                created_at=txn.created_at, conn=conn, bytes_size=bytes_size, checksum=checksum,
+                duration_ms=duration_ms,
+            )
+            result["export_id"] = export_id
+
+        txn.record(finish)
         return result
 
-    def _failure(self, export_id: int, output_path: Optional[str], message: str, error: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        db_finish_failure(export_id, output_path, message, error, metadata)
-        return {
+    def _failure(self, txn: ExportTxn, output_path: Optional[str], message: str, error: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        duration_ms = txn.elapsed_ms()
+        result: Dict[str, Any] = {
             "success": False,
             "status": "failure",
-            "export_id": export_id,
+            "export_id": txn.export_id,
             "message": message,
             "error": error,
             "output_file": output_path,
         }
 
+        def finish(conn: sqlite3.Connection, export_id: int) -> None:
+            db_finish_failure(
+                export_id, output_path, message, error, metadata,
+                created_at=txn.created_at, conn=conn, duration_ms=duration_ms,
+            )
+            result["export_id"] = export_id
+
+        txn.record(finish)
+        return result
+
 class PDFExporter(BaseExporter):
     def __init__(self, input_encoding: str = 'utf-8'):
         """
@@ -333,53 +775,8 @@ class PDFExporter(BaseExporter):
         self.input_encoding = input_encoding
 
     def read_markdown_file(self, file_path: str) -> Dict[str, Any]:
-        """
-        Safely read a markdown file with proper encoding handling
-        
-        Args:
-            file_path (str): Path to the markdown file
-            
-        Returns:
-            Dict[str, Any]: Response containing success status, message and content if successful
-        """
-        try:
-            # First try with specified encoding
-            with open(file_path, 'r', encoding=self.input_encoding) as f:
-                return {
-                    "success": True,
-                    "message": "File read successfully",
-                    "content": f.read()
-                }
-        except UnicodeDecodeError:
-            # If that fails, try with utf-8-sig (handles BOM)
-            try:
-                with open(file_path, 'r', encoding='utf-8-sig') as f:
-                    return {
-                        "success": True,
-                        "message": "File read successfully using utf-8-sig encoding",
-                        "content": f.read()
-                    }
-            except UnicodeDecodeError:
-                # Last resort: try with errors='replace' to handle unknown characters
-                try:
-                    with open(file_path, 'r', encoding=self.input_encoding, errors='replace') as f:
-                        return {
-                            "success": True,
-                            "message": "File read with some character replacements",
-                            "content": f.read()
-                        }
-                except Exception as e:
-                    return {
-                        "success": False,
-                        "message": f"Failed to read file: {str(e)}",
-                        "error": str(e)
-                    }
-        except Exception as e:
-            return {
-                "success": False,
-                "message": f"Error reading file: {str(e)}",
-                "error": str(e)
-            }
+        """Read a markdown file using this exporter's input encoding (see module-level read_markdown_file)"""
+        return read_markdown_file(file_path, self.input_encoding)
 
     def convert_to_pdf(self, input_path: str, output_path: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -406,30 +803,33 @@ class PDFExporter(BaseExporter):
             output_path = self._resolve_out(output_path, "pdf", Path(input_path).stem)
 
             # Start DB record
-            export_id = self._start("pdf", "file", input_path, output_path)
+            txn = self._start("pdf", "file", input_path, output_path)
 
             # Read the markdown content
             read_result = self.read_markdown_file(input_path)
             if not read_result["success"]:
-                return self._failure(export_id, output_path, read_result.get("message", "Failed to read input"), str(read_result.get("error")))
+                return self._failure(txn, output_path, read_result.get("message", "Failed to read input"), str(read_result.get("error")))
 
             # Convert to PDF
             pdf = MarkdownPdf()
             pdf.add_section(Section(read_result["content"]))
             pdf.save(output_path)
 
-            ok = self._success(export_id, output_path, "PDF generated successfully")
+            # Input fingerprint; repeated exports of an unchanged file hit the stat-keyed cache
+            input_sha256 = compute_sha256(input_path)
+            metadata = {"input_sha256": input_sha256} if input_sha256 else None
+            ok = self._success(txn, output_path, "PDF generated successfully", metadata=metadata)
             ok["input_file"] = input_path
             return ok
 
         except Exception as e:
-            exp_id = None
+            exp_txn = None
             try:
-                # If export_id was created
-                exp_id = locals().get("export_id")
+                # If the export record was started
+                exp_txn = locals().get("txn")
                 out_p = locals().get("output_path") if "output_path" in locals() else None
-                if exp_id is not None:
-                    return self._failure(exp_id, out_p, "Error converting markdown to PDF", str(e))
+                if exp_txn is not None:
+                    return self._failure(exp_txn, out_p, "Error converting markdown to PDF", str(e))
             except Exception:
                 pass
             return {"success": False, "message": f"Error converting markdown to PDF: {str(e)}", "error": str(e), "input_file": input_path, "output_file": locals().get("output_path") if "output_path" in locals() else None}
@@ -472,7 +872,7 @@ class DocxExporter(BaseExporter):
             # Resolve output path under OUTPUT_DIR
             output_file = self._resolve_out(output_file, "docx", "export-docx")
 
-            export_id = self._start("docx", "text", None, output_file)
+            txn = self._start("docx", "text", None, output_file)
 
             # Convert to DOCX
             pypandoc.convert_text(
@@ -483,13 +883,13 @@ class DocxExporter(BaseExporter):
                 extra_args=["--standalone"]
             )
 
-            return self._success(export_id, output_file, f"Successfully converted to {output_file}")
+            return self._success(txn, output_file, f"Successfully converted to {output_file}")
 
         except Exception as e:
-            exp_id = locals().get("export_id")
+            exp_txn = locals().get("txn")
             out_p = locals().get("output_file") if "output_file" in locals() else None
-            if exp_id is not None:
-                return self._failure(exp_id, out_p, "Error converting markdown to DOCX", str(e))
+            if exp_txn is not None:
+                return self._failure(exp_txn, out_p, "Error converting markdown to DOCX", str(e))
             return {"success": False, "message": f"Error converting markdown to DOCX: {str(e)}", "error": str(e), "output_file": out_p}
 
     def convert_markdown_file_to_docx(self, input_path: str, output_path: Optional[str] = None) -> Dict[str, Any]:
@@ -516,21 +916,21 @@ class DocxExporter(BaseExporter):
             # Resolve output path under OUTPUT_DIR
             output_path = self._resolve_out(output_path, "docx", Path(input_path).stem)
 
-            export_id = self._start("docx", "file", input_path, output_path)
+            txn = self._start("docx", "file", input_path, output_path)
 
             # Read the markdown content
-            read_result = PDFExporter().read_markdown_file(input_path)  # Reuse the reading logic
+            read_result = read_markdown_file(input_path)
             if not read_result["success"]:
-                return self._failure(export_id, output_path, read_result.get("message", "Failed to read input"), str(read_result.get("error")))
+                return self._failure(txn, output_path, read_result.get("message", "Failed to read input"), str(read_result.get("error")))
 
             # Convert to DOCX
             try:
                 pypandoc.convert_text(read_result["content"], "docx", format="md", outputfile=output_path, extra_args=["--standalone"])
-                ok = self._success(export_id, output_path, f"DOCX generated successfully from {input_path}")
+                ok = self._success(txn, output_path, f"DOCX generated successfully from {input_path}")
                 ok["input_file"] = input_path
                 return ok
             except Exception as e:
-                return self._failure(export_id, output_path, "Error converting markdown file to DOCX", str(e))
+                return self._failure(txn, output_path, "Error converting markdown file to DOCX", str(e))
 
         except Exception as e:
             return {
@@ -560,7 +960,6 @@ class XlsxExporter(BaseExporter):
         Returns:
             Dict[str, Any]: Response containing success status and message
         """
-        csv_path = None
         try:
             # Validate inputs
             if not markdown_text or not markdown_text.strip():
@@ -580,41 +979,27 @@ class XlsxExporter(BaseExporter):
             # Resolve output path under OUTPUT_DIR
             output_file = self._resolve_out(output_file, "xlsx", "export-xlsx")
 
-            export_id = self._start("xlsx", "text", None, output_file)
-
-            # Create a temporary CSV file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp_csv:
-                csv_path = tmp_csv.name
+            txn = self._start("xlsx", "text", None, output_file)
 
-            # Convert Markdown → CSV using Pandoc
-            pypandoc.convert_text(
+            # Convert Markdown → CSV using Pandoc (kept in memory, no temp file)
+            csv_text = pypandoc.convert_text(
                 markdown_text,
                 "csv",
                 format="md",
-                outputfile=csv_path,
                 extra_args=["--standalone"]
             )
 
             # Load CSV → DataFrame → Excel
-            df = pd.read_csv(csv_path)
-            df.to_excel(output_file, index=False)
-
-            # Clean up temporary file
-            os.remove(csv_path)
+            df = pd.read_csv(io.StringIO(csv_text))
+            write_xlsx(df, output_file)
 
-            return self._success(export_id, output_file, f"Successfully converted markdown table to {output_file}", rows=len(df), columns=len(df.columns))
+            return self._success(txn, output_file, f"Successfully converted markdown table to {output_file}", rows=len(df), columns=len(df.columns))
 
         except Exception as e:
-            # Clean up temporary file if it exists
-            if csv_path and os.path.exists(csv_path):
-                try:
-                    os.remove(csv_path)
-                except:
-                    pass  # Ignore cleanup errors
-            exp_id = locals().get("export_id")
+            exp_txn = locals().get("txn")
             out_p = locals().get("output_file") if "output_file" in locals() else None
-            if exp_id is not None:
-                return self._failure(exp_id, out_p, "Error converting markdown to XLSX", str(e))
+            if exp_txn is not None:
+                return self._failure(exp_txn, out_p, "Error converting markdown to XLSX", str(e))
             return {"success": False, "message": f"Error converting markdown to XLSX: {str(e)}", "error": str(e), "output_file": out_p}
 
     def convert_markdown_file_to_xlsx(self, input_path: str, output_path: Optional[str] = None) -> Dict[str, Any]:
@@ -641,30 +1026,23 @@ class XlsxExporter(BaseExporter):
             # Resolve output path under OUTPUT_DIR
             output_path = self._resolve_out(output_path, "xlsx", Path(input_path).stem)
 
-            export_id = self._start("xlsx", "file", input_path, output_path)
+            txn = self._start("xlsx", "file", input_path, output_path)
 
             # Read the markdown content
-            read_result = PDFExporter().read_markdown_file(input_path)  # Reuse the reading logic
+            read_result = read_markdown_file(input_path)
             if not read_result["success"]:
-                return self._failure(export_id, output_path, read_result.get("message", "Failed to read input"), str(read_result.get("error")))
+                return self._failure(txn, output_path, read_result.get("message", "Failed to read input"), str(read_result.get("error")))
 
             # Convert to XLSX
             try:
-                # Create a temporary CSV file
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp_csv:
-                    csv_path = tmp_csv.name
-                pypandoc.convert_text(read_result["content"], "csv", format="md", outputfile=csv_path, extra_args=["--standalone"])
-                df = pd.read_csv(csv_path)
-                df.to_excel(output_path, index=False)
-                try:
-                    os.remove(csv_path)
-                except Exception:
-                    pass
-                ok = self._success(export_id, output_path, f"XLSX generated successfully from {input_path}", rows=len(df), columns=len(df.columns))
+                csv_text = pypandoc.convert_text(read_result["content"], "csv", format="md", extra_args=["--standalone"])
+                df = pd.read_csv(io.StringIO(csv_text))
+                write_xlsx(df, output_path)
+                ok = self._success(txn, output_path, f"XLSX generated successfully from {input_path}", rows=len(df), columns=len(df.columns))
                 ok["input_file"] = input_path
                 return ok
             except Exception as e:
-                return self._failure(export_id, output_path, "Error converting markdown file to XLSX", str(e))
+                return self._failure(txn, output_path, "Error converting markdown file to XLSX", str(e))
 
         except Exception as e:
             return {
@@ -713,47 +1091,38 @@ class CsvExporter(BaseExporter):
             # Resolve output path under OUTPUT_DIR
             output_file = self._resolve_out(output_file, "csv", "export-csv")
 
-            export_id = self._start("csv", "text", None, output_file)
+            txn = self._start("csv", "text", None, output_file)
 
-            # Convert Markdown → CSV using Pandoc
-            pypandoc.convert_text(
+            # Convert Markdown → CSV using Pandoc and write it ourselves, so size and
+            # checksum come from the bytes written instead of re-reading the file
+            csv_text = pypandoc.convert_text(
                 markdown_text,
                 "csv",
                 format="md",
-                outputfile=output_file,
                 extra_args=["--standalone"]
             )
+            with HashingWriter(output_file) as out:
+                out.write(csv_text.encode("utf-8"))
 
-            # Count rows and columns if file was created
-            row_count = 0
-            col_count = 0
-            if os.path.exists(output_file):
-                try:
-                    df = pd.read_csv(output_file)
-                    row_count = len(df)
-                    col_count = len(df.columns)
-                except Exception:
-                    # If pandas can't read it, count lines manually
-                    with open(output_file, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                        row_count = len(lines) - 1 if lines else 0  # Subtract header
-                        if lines:
-                            col_count = len(lines[0].strip().split(',')) if lines[0].strip() else 0
+            # Count rows and columns
+            row_count, col_count = count_csv_table(csv_text)
 
             ok = self._success(
-                export_id,
+                txn,
                 output_file,
                 f"Successfully converted markdown table to {output_file}",
                 rows=row_count,
                 columns=col_count,
+                bytes_size=out.bytes_size,
+                checksum=out.checksum,
             )
             return ok
 
         except Exception as e:
-            exp_id = locals().get("export_id")
+            exp_txn = locals().get("txn")
             out_p = locals().get("output_file") if "output_file" in locals() else None
-            if exp_id is not None:
-                return self._failure(exp_id, out_p, "Error converting markdown to CSV", str(e))
+            if exp_txn is not None:
+                return self._failure(exp_txn, out_p, "Error converting markdown to CSV", str(e))
             return {"success": False, "message": f"Error converting markdown to CSV: {str(e)}", "error": str(e), "output_file": out_p}
 
     def convert_markdown_file_to_csv(self, input_path: str, output_path: Optional[str] = None) -> Dict[str, Any]:
@@ -780,35 +1149,25 @@ class CsvExporter(BaseExporter):
             # Resolve output path under OUTPUT_DIR
             output_path = self._resolve_out(output_path, "csv", Path(input_path).stem)
 
-            export_id = self._start("csv", "file", input_path, output_path)
+            txn = self._start("csv", "file", input_path, output_path)
 
             # Read the markdown content
-            read_result = PDFExporter().read_markdown_file(input_path)  # Reuse the reading logic
+            read_result = read_markdown_file(input_path)
             if not read_result["success"]:
-                return self._failure(export_id, output_path, read_result.get("message", "Failed to read input"), str(read_result.get("error")))
+                return self._failure(txn, output_path, read_result.get("message", "Failed to read input"), str(read_result.get("error")))
 
             # Convert to CSV
             try:
-                pypandoc.convert_text(read_result["content"], "csv", format="md", outputfile=output_path, extra_args=["--standalone"])
+                csv_text = pypandoc.convert_text(read_result["content"], "csv", format="md", extra_args=["--standalone"])
+                with HashingWriter(output_path) as out:
+                    out.write(csv_text.encode("utf-8"))
                 # Count rows/columns
-                row_count = 0
-                col_count = 0
-                if os.path.exists(output_path):
-                    try:
-                        df = pd.read_csv(output_path)
-                        row_count = len(df)
-                        col_count = len(df.columns)
-                    except Exception:
-                        with open(output_path, 'r', encoding='utf-8') as f:
-                            lines = f.readlines()
-                            row_count = len(lines) - 1 if lines else 0
-                            if lines:
-                                col_count = len(lines[0].strip().split(',')) if lines[0].strip() else 0
-                ok = self._success(export_id, output_path, f"CSV generated successfully from {input_path}", rows=row_count, columns=col_count)
+                row_count, col_count = count_csv_table(csv_text)
+                ok = self._success(txn, output_path, f"CSV generated successfully from {input_path}", rows=row_count, columns=col_count, bytes_size=out.bytes_size, checksum=out.checksum)
                 ok["input_file"] = input_path
                 return ok
             except Exception as e:
-                return self._failure(export_id, output_path, "Error converting markdown file to CSV", str(e))
+                return self._failure(txn, output_path, "Error converting markdown file to CSV", str(e))
 
         except Exception as e:
             return {
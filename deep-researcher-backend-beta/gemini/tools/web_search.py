@@ -4,10 +4,16 @@ Provides functions to scrape URLs and save them with metadata tracking.
 """
 
 import asyncio
+import atexit
+import base64
 import hashlib
+import os
 import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
 from urllib.parse import urlparse
@@ -23,249 +29,24 @@ try:
 except ImportError:
     EXTRACT_FAVICON_AVAILABLE = False
 
+try:
+    from blake3 import blake3
+
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
 
-COUNTRY_CODES = {
-    "Afghanistan": "af",
-    "Albania": "al",
-    "Algeria": "dz",
-    "American Samoa": "as",
-    "Andorra": "ad",
-    "Angola": "ao",
-    "Anguilla": "ai",
-    "Antarctica": "aq",
-    "Antigua and Barbuda": "ag",
-    "Argentina": "ar",
-    "Armenia": "am",
-    "Aruba": "aw",
-    "Australia": "au",
-    "Austria": "at",
-    "Azerbaijan": "az",
-    "Bahamas": "bs",
-    "Bahrain": "bh",
-    "Bangladesh": "bd",
-    "Barbados": "bb",
-    "Belarus": "by",
-    "Belgium": "be",
-    "Belize": "bz",
-    "Benin": "bj",
-    "Bermuda": "bm",
-    "Bhutan": "bt",
-    "Bolivia": "bo",
-    "Bosnia and Herzegovina": "ba",
-    "Botswana": "bw",
-    "Bouvet Island": "bv",
-    "Brazil": "br",
-    "British Indian Ocean Territory": "io",
-    "Brunei Darussalam": "bn",
-    "Bulgaria": "bg",
-    "Burkina Faso": "bf",
-    "Burundi": "bi",
-    "Cambodia": "kh",
-    "Cameroon": "cm",
-    "Canada": "ca",
-    "Cape Verde": "cv",
-    "Cayman Islands": "ky",
-    "Central African Republic": "cf",
-    "Chad": "td",
-    "Chile": "cl",
-    "China": "cn",
-    "Christmas Island": "cx",
-    "Cocos (Keeling) Islands": "cc",
-    "Colombia": "co",
-    "Comoros": "km",
-    "Congo": "cg",
-    "Congo, the Democratic Republic of the": "cd",
-    "Cook Islands": "ck",
-    "Costa Rica": "cr",
-    "Cote D'ivoire": "ci",
-    "Croatia": "hr",
-    "Cuba": "cu",
-    "Cyprus": "cy",
-    "Czech Republic": "cz",
-    "Denmark": "dk",
-    "Djibouti": "dj",
-    "Dominica": "dm",
-    "Dominican Republic": "do",
-    "Ecuador": "ec",
-    "Egypt": "eg",
-    "El Salvador": "sv",
-    "Equatorial Guinea": "gq",
-    "Eritrea": "er",
-    "Estonia": "ee",
-    "Ethiopia": "et",
-    "Falkland Islands (Malvinas)": "fk",
-    "Faroe Islands": "fo",
-    "Fiji": "fj",
-    "Finland": "fi",
-    "France": "fr",
-    "French Guiana": "gf",
-    "French Polynesia": "pf",
-    "French Southern Territories": "tf",
-    "Gabon": "ga",
-    "Gambia": "gm",
-    "Georgia": "ge",
-    "Germany": "de",
-    "Ghana": "gh",
-    "Gibraltar": "gi",
-    "Greece": "gr",
-    "Greenland": "gl",
-    "Grenada": "gd",
-    "Guadeloupe": "gp",
-    "Guam": "gu",
-    "Guatemala": "gt",
-    "Guinea": "gn",
-    "Guinea-Bissau": "gw",
-    "Guyana": "gy",
-    "Haiti": "ht",
-    "Heard Island and Mcdonald Islands": "hm",
-    "Holy See (Vatican City State)": "va",
-    "Honduras": "hn",
-    "Hong Kong": "hk",
-    "Hungary": "hu",
-    "Iceland": "is",
-    "India": "in",
-    "Indonesia": "id",
-    "Iran, Islamic Republic of": "ir",
-    "Iraq": "iq",
-    "Ireland": "ie",
-    "Israel": "il",
-    "Italy": "it",
-    "Jamaica": "jm",
-    "Japan": "jp",
-    "Jordan": "jo",
-    "Kazakhstan": "kz",
-    "Kenya": "ke",
-    "Kiribati": "ki",
-    "Korea, Democratic People's Republic of": "kp",
-    "Korea, Republic of": "kr",
-    "Kuwait": "kw",
-    "Kyrgyzstan": "kg",
-    "Lao People's Democratic Republic": "la",
-    "Latvia": "lv",
-    "Lebanon": "lb",
-    "Lesotho": "ls",
-    "Liberia": "lr",
-    "Libyan Arab Jamahiriya": "ly",
-    "Liechtenstein": "li",
-    "Lithuania": "lt",
-    "Luxembourg": "lu",
-    "Macao": "mo",
-    "Macedonia, the Former Yugosalv Republic of": "mk",
-    "Madagascar": "mg",
-    "Malawi": "mw",
-    "Malaysia": "my",
-    "Maldives": "mv",
-    "Mali": "ml",
-    "Malta": "mt",
-    "Marshall Islands": "mh",
-    "Martinique": "mq",
-    "Mauritania": "mr",
-    "Mauritius": "mu",
-    "Mayotte": "yt",
-    "Mexico": "mx",
-    "Micronesia, Federated States of": "fm",
-    "Moldova, Republic of": "md",
-    "Monaco": "mc",
-    "Mongolia": "mn",
-    "Montserrat": "ms",
-    "Morocco": "ma",
-    "Mozambique": "mz",
-    "Myanmar": "mm",
-    "Namibia": "na",
-    "Nauru": "nr",
-    "Nepal": "np",
-    "Netherlands": "nl",
-    "Netherlands Antilles": "an",
-    "New Caledonia": "nc",
-    "New Zealand": "nz",
-    "Nicaragua": "ni",
-    "Niger": "ne",
-    "Nigeria": "ng",
-    "Niue": "nu",
-    "Norfolk Island": "nf",
-    "Northern Mariana Islands": "mp",
-    "Norway": "no",
-    "Oman": "om",
-    "Pakistan": "pk",
-    "Palau": "pw",
-    "Palestinian Territory, Occupied": "ps",
-    "Panama": "pa",
-    "Papua New Guinea": "pg",
-    "Paraguay": "py",
-    "Peru": "pe",
-    "Philippines": "ph",
-    "Pitcairn": "pn",
-    "Poland": "pl",
-    "Portugal": "pt",
-    "Puerto Rico": "pr",
-    "Qatar": "qa",
-    "Reunion": "re",
-    "Romania": "ro",
-    "Russian Federation": "ru",
-    "Rwanda": "rw",
-    "Saint Helena": "sh",
-    "Saint Kitts and Nevis": "kn",
-    "Saint Lucia": "lc",
-    "Saint Pierre and Miquelon": "pm",
-    "Saint Vincent and the Grenadines": "vc",
-    "Samoa": "ws",
-    "San Marino": "sm",
-    "Sao Tome and Principe": "st",
-    "Saudi Arabia": "sa",
-    "Senegal": "sn",
-    "Serbia and Montenegro": "cs",
-    "Seychelles": "sc",
-    "Sierra Leone": "sl",
-    "Singapore": "sg",
-    "Slovakia": "sk",
-    "Slovenia": "si",
-    "Solomon Islands": "sb",
-    "Somalia": "so",
-    "South Africa": "za",
-    "South Georgia and the South Sandwich Islands": "gs",
-    "Spain": "es",
-    "Sri Lanka": "lk",
-    "Sudan": "sd",
-    "Suriname": "sr",
-    "Svalbard and Jan Mayen": "sj",
-    "Swaziland": "sz",
-    "Sweden": "se",
-    "Switzerland": "ch",
-    "Syrian Arab Republic": "sy",
-    "Taiwan, Province of China": "tw",
-    "Tajikistan": "tj",
-    "Tanzania, United Republic of": "tz",
-    "Thailand": "th",
-    "Timor-Leste": "tl",
-    "Togo": "tg",
-    "Tokelau": "tk",
-    "Tonga": "to",
-    "Trinidad and Tobago": "tt",
-    "Tunisia": "tn",
-    "Turkey": "tr",
-    "Turkmenistan": "tm",
-    "Turks and Caicos Islands": "tc",
-    "Tuvalu": "tv",
-    "Uganda": "ug",
-    "Ukraine": "ua",
-    "United Arab Emirates": "ae",
-    "United Kingdom": "uk",
-    "United States": "us",
-    "United States Minor Outlying Islands": "um",
-    "Uruguay": "uy",
-    "Uzbekistan": "uz",
-    "Vanuatu": "vu",
-    "Venezuela": "ve",
-    "Viet Nam": "vn",
-    "Virgin Islands, British": "vg",
-    "Virgin Islands, U.S.": "vi",
-    "Wallis and Futuna": "wf",
-    "Western Sahara": "eh",
-    "Yemen": "ye",
-    "Zambia": "zm",
-    "Zimbabwe": "zw",
-}
+_COUNTRY_CODES_PATH = Path(__file__).with_name("country_codes.json")
+
+
+@lru_cache(maxsize=1)
+def country_codes() -> Dict[str, str]:
+    """Country name -> region code map, loaded from country_codes.json on first use."""
+    with open(_COUNTRY_CODES_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
 
 # Database path
 DB_PATH = Path("bucket/_downloads/crawls/crawls.sqlite3")
@@ -274,31 +55,104 @@ CRAWLS_DIR = Path("bucket/_downloads/crawls")
 
 # Web Crawling
 
-def init_database() -> None:
-    """Initialize SQLite database with crawls table."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+_INSERT_CRAWL_SQL = """
+    INSERT INTO crawls (url, title, file_path, favicon, status_code, word_count, crawl_duration)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+# A URL crawled again on the same day overwrites the same file, so its row is refreshed to match
+_UPSERT_CRAWL_SQL = """
+    INSERT INTO crawls (url, title, file_path, favicon, status_code, word_count, crawl_duration)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url, date(timestamp)) DO UPDATE SET
+        title=excluded.title,
+        timestamp=excluded.timestamp,
+        file_path=excluded.file_path,
+        favicon=excluded.favicon,
+        status_code=excluded.status_code,
+        word_count=excluded.word_count,
+        crawl_duration=excluded.crawl_duration
+"""
+# Upsert needs idx_crawls_url_day; init_database switches to it once the index exists
+_crawl_insert_sql = _INSERT_CRAWL_SQL
+
+# Bumped when init_database gains a one-off migration step
+_CRAWLS_SCHEMA_VERSION = 1
+
+# One shared autocommit connection; the lock serializes use across worker threads
+_CONN: Optional[sqlite3.Connection] = None
+_CONN_LOCK = threading.RLock()
 
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
 
-    cursor.execute(
+def _get_conn() -> sqlite3.Connection:
+    """Return the module connection, opening it in WAL mode on first use."""
+    global _CONN
+    with _CONN_LOCK:
+        if _CONN is None:
+            DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-8000")
+            _CONN = conn
+            atexit.register(_close_conn)
+        return _CONN
+
+
+def _close_conn() -> None:
+    global _CONN
+    with _CONN_LOCK:
+        if _CONN is not None:
+            _CONN.close()
+            _CONN = None
+
+
+def init_database() -> None:
+    """Initialize SQLite database with crawls table."""
+    global _crawl_insert_sql
+    with _CONN_LOCK:
+        conn = _get_conn()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawls (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                title TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                file_path TEXT,
+                favicon TEXT,
+                status_code INTEGER,
+                word_count INTEGER,
+                crawl_duration REAL
+            )
         """
-        CREATE TABLE IF NOT EXISTS crawls (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            url TEXT NOT NULL,
-            title TEXT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            file_path TEXT,
-            favicon TEXT,
-            status_code INTEGER,
-            word_count INTEGER,
-            crawl_duration REAL
         )
-    """
-    )
 
-    conn.commit()
-    conn.close()
+        if conn.execute("PRAGMA user_version").fetchone()[0] < _CRAWLS_SCHEMA_VERSION:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_crawls_timestamp ON crawls(timestamp)"
+                )
+                # url leads the unique index, so it also serves plain url lookups.
+                # Older databases may already hold same-day repeats; crawl history is never
+                # deleted, so those databases keep plain inserts without the unique index.
+                try:
+                    conn.execute(
+                        "CREATE UNIQUE INDEX IF NOT EXISTS idx_crawls_url_day ON crawls(url, date(timestamp))"
+                    )
+                except sqlite3.IntegrityError:
+                    print("crawls has same-day duplicate rows; skipping idx_crawls_url_day")
+                conn.execute(f"PRAGMA user_version = {_CRAWLS_SCHEMA_VERSION}")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+        has_unique_index = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_crawls_url_day'"
+        ).fetchone()
+        _crawl_insert_sql = _UPSERT_CRAWL_SQL if has_unique_index else _INSERT_CRAWL_SQL
 
 
 def insert_crawl_record(
@@ -311,33 +165,66 @@ def insert_crawl_record(
     crawl_duration: float,
 ) -> None:
     """Insert a crawl record into the database."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with _CONN_LOCK:
+        _get_conn().execute(
+            _crawl_insert_sql,
+            (url, title, file_path, favicon, status_code, word_count, crawl_duration),
+        )
 
-    cursor.execute(
-        """
-        INSERT INTO crawls (url, title, file_path, favicon, status_code, word_count, crawl_duration)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """,
-        (url, title, file_path, favicon, status_code, word_count, crawl_duration),
-    )
 
-    conn.commit()
-    conn.close()
+def _insert_crawl_records(rows: List[tuple]) -> None:
+    """Insert many crawl records with one executemany and a single commit."""
+    if not rows:
+        return
+    with _CONN_LOCK:
+        conn = _get_conn()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(_crawl_insert_sql, rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
 
 
-def get_daily_folder() -> Path:
-    """Get or create the daily folder path (YYYY-MM-DD-Day format)."""
-    now = datetime.now()
-    folder_name = now.strftime("%Y-%m-%d-%A")
+@lru_cache(maxsize=2)  # two entries cover the midnight rollover
+def _daily_folder_for(folder_name: str) -> Path:
     daily_path = CRAWLS_DIR / folder_name
     daily_path.mkdir(parents=True, exist_ok=True)
     return daily_path
 
 
+def get_daily_folder() -> Path:
+    """Get or create the daily folder path (YYYY-MM-DD-Day format)."""
+    return _daily_folder_for(datetime.now().strftime("%Y-%m-%d-%A"))
+
+
+@lru_cache(maxsize=1024)
+def _favicon_for_origin(origin: str) -> Optional[str]:
+    """
+    Look up an origin's favicon with extract_favicon once per process (network fetch).
+    Errors propagate, so lru_cache only keeps successful lookups and failures are retried.
+    """
+    favicons = from_url(origin)
+    if not favicons:
+        return None
+
+    ico_favicon = None
+    png_favicon = None
+
+    for favicon in favicons:
+        if favicon.format == "ico" and not ico_favicon:
+            ico_favicon = favicon.url
+        elif favicon.format == "png" and not png_favicon:
+            png_favicon = favicon.url
+
+    return ico_favicon or png_favicon or favicons[0].url
+
+
 def extract_favicon(result, url: str) -> str:
     """
-    Extract favicon using extract_favicon library (if available), with fallback to metadata and standard URL.
+    Extract favicon from crawl metadata, then the extract_favicon library (cached per origin),
+    with fallback to the standard /favicon.ico URL.
 
     Args:
         result: CrawlResult from crawl4ai
@@ -346,46 +233,60 @@ def extract_favicon(result, url: str) -> str:
     Returns:
         Favicon URL as string
     """
+    metadata = getattr(result, "metadata", None)
+    if metadata:
+        favicon = metadata.get("favicon") or metadata.get("icon")
+        if favicon:
+            return favicon
+
+    parsed = urlparse(url)
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+
     if EXTRACT_FAVICON_AVAILABLE:
         try:
-            favicons = from_url(url)
+            favicon = _favicon_for_origin(origin)
+            if favicon:
+                return favicon
+        except Exception as e:
+            print(f"extract_favicon library failed: {e}")
 
-            if favicons:
-                ico_favicon = None
-                png_favicon = None
+    return f"{origin}/favicon.ico"
 
-                for favicon in favicons:
-                    if favicon.format == "ico" and not ico_favicon:
-                        ico_favicon = favicon.url
-                    elif favicon.format == "png" and not png_favicon:
-                        png_favicon = favicon.url
 
-                if ico_favicon:
-                    return ico_favicon
-                elif png_favicon:
-                    return png_favicon
-                else:
-                    return favicons[0].url
+def _url_digest(data: bytes) -> str:
+    """16-byte BLAKE3 (or BLAKE2b) digest as unpadded URL-safe base64 (22 chars instead of 32 hex)."""
+    if BLAKE3_AVAILABLE:
+        digest = blake3(data).digest(length=16)
+    else:
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
 
-        except Exception as e:
-            print(f"extract_favicon library failed: {e}")
 
-    if hasattr(result, "metadata") and result.metadata:
-        favicon = result.metadata.get("favicon")
-        if favicon:
-            return favicon
+# O_BINARY keeps Windows from translating newlines; it is 0 (absent) elsewhere
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
 
-        icon = result.metadata.get("icon")
-        if icon:
-            return icon
 
-    parsed = urlparse(url)
-    return f"{parsed.scheme}://{parsed.netloc}/favicon.ico"
+def _write_bytes(path: Path, *chunks: bytes) -> None:
+    """Write already-encoded chunks in order with raw os.write calls, bypassing the io text stack."""
+    try:
+        fd = os.open(path, _WRITE_FLAGS, 0o644)
+    except FileNotFoundError:
+        # _daily_folder_for only creates the folder on a cache miss; recreate it if it was removed since
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        for data in chunks:
+            # os.write may write less than asked for large payloads; slicing a memoryview avoids copies
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 def save_markdown(content: str, url: str, daily_folder: Path) -> str:
     """
-    Save markdown content to file with unique MD5 hash-based filename.
+    Save markdown content to file with unique BLAKE3 (or BLAKE2b) hash-based filename.
 
     Args:
         content: Markdown content to save
@@ -395,13 +296,12 @@ def save_markdown(content: str, url: str, daily_folder: Path) -> str:
     Returns:
         Relative file path as string
     """
-    url_hash = hashlib.md5(url.encode("utf-8")).hexdigest()
+    url_hash = _url_digest(url.encode("utf-8"))
     filename = f"{url_hash}.md"
 
     file_path = daily_folder / filename
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    _write_bytes(file_path, content.encode("utf-8"))
 
     return str(file_path)
 
@@ -430,6 +330,105 @@ Favicon: {favicon}
     return citation
 
 
+def write_citation(path: Path, title: str, url: str, favicon: str, content: str) -> None:
+    """
+    Write the same text format_citation returns straight to a file.
+
+    The header and content are written one after the other, so the content is
+    never copied into a combined string first.
+
+    Args:
+        path: File to create or overwrite
+        title: Page title
+        url: Page URL
+        favicon: Favicon URL
+        content: Markdown content
+    """
+    header = f"---\nTitle: {title}\nURL: {url}\nFavicon: {favicon}\n---\n\n"
+    _write_bytes(path, header.encode("utf-8"), content.encode("utf-8"), b"\n")
+
+
+# Disk and SQLite work is handed to these threads so it overlaps with crawl processing
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="web-search-io")
+
+
+async def _run_io(func, *args):
+    """Run a blocking call on the I/O executor without stalling the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_IO_EXECUTOR, func, *args)
+
+
+async def _save_crawl(
+    content: str,
+    url: str,
+    daily_folder: Path,
+    title: str,
+    favicon: str,
+    status_code: int,
+    word_count: int,
+    crawl_duration: float,
+) -> tuple:
+    """Save the markdown off the event loop and return the matching crawls row."""
+    file_path = await _run_io(save_markdown, content, url, daily_folder)
+    return (url, title, file_path, favicon, status_code, word_count, crawl_duration)
+
+
+def _extract_record(
+    result, md_has_raw: Optional[bool] = None, url: Optional[str] = None
+) -> tuple:
+    """
+    Read every field the scrapers need from a CrawlResult in one place.
+
+    Args:
+        result: Successful CrawlResult from crawl4ai
+        md_has_raw: Whether result.markdown has raw_markdown; probed here when None
+        url: URL to report; defaults to result.url
+
+    Returns:
+        (url, title, favicon, status_code, markdown_content)
+    """
+    url = url or result.url
+    metadata = result.metadata or {}
+    markdown = result.markdown
+    if md_has_raw is None:
+        md_has_raw = hasattr(markdown, "raw_markdown")
+    return (
+        url,
+        metadata.get("title", "Untitled"),
+        extract_favicon(result, url),
+        result.status_code,
+        markdown.raw_markdown if md_has_raw else str(markdown),
+    )
+
+
+# Sync wrappers reuse one event loop per calling thread instead of building one per call.
+# Per-thread because a Runner cannot be entered twice at once (e.g. FastAPI's threadpool).
+_runner_tls = threading.local()
+_all_runners: List[asyncio.Runner] = []
+_all_runners_lock = threading.Lock()
+
+
+def _get_runner() -> asyncio.Runner:
+    runner = getattr(_runner_tls, "runner", None)
+    if runner is None:
+        runner = asyncio.Runner()
+        _runner_tls.runner = runner
+        with _all_runners_lock:
+            if not _all_runners:
+                atexit.register(_close_runners)
+            _all_runners.append(runner)
+    return runner
+
+
+def _close_runners() -> None:
+    with _all_runners_lock:
+        for runner in _all_runners:
+            try:
+                runner.close()
+            except Exception:
+                pass
+        _all_runners.clear()
+
+
 def scrape_url(url: str) -> str:
     """
     Scrape a single URL and save it with metadata tracking.
@@ -440,7 +439,7 @@ def scrape_url(url: str) -> str:
     Returns:
         Formatted string with citation and scraped content
     """
-    return asyncio.run(_scrape_url_async(url))
+    return _get_runner().run(_scrape_url_async(url))
 
 
 async def _scrape_url_async(url: str) -> str:
@@ -449,7 +448,7 @@ async def _scrape_url_async(url: str) -> str:
 
     daily_folder = get_daily_folder()
 
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     config = CrawlerRunConfig(
         cache_mode=CacheMode.BYPASS,
@@ -465,36 +464,20 @@ async def _scrape_url_async(url: str) -> str:
             print(error_msg)
             return f"Error: {error_msg}"
 
-        # Extract metadata
-        title = (
-            result.metadata.get("title", "Untitled") if result.metadata else "Untitled"
-        )
-        favicon = extract_favicon(result, url)
-        status_code = result.status_code
-
-        # Get markdown content
-        markdown_content = (
-            result.markdown.raw_markdown
-            if hasattr(result.markdown, "raw_markdown")
-            else str(result.markdown)
-        )
+        # Extract metadata and markdown content
+        _, title, favicon, status_code, markdown_content = _extract_record(result, url=url)
 
         # Calculate metadata
         word_count = len(markdown_content.split())
-        crawl_duration = time.time() - start_time
+        crawl_duration = time.perf_counter() - start_time
 
         # Save markdown file
-        file_path = save_markdown(markdown_content, url, daily_folder)
+        file_path = await _run_io(save_markdown, markdown_content, url, daily_folder)
 
         # Insert into database
-        insert_crawl_record(
-            url=url,
-            title=title,
-            file_path=file_path,
-            favicon=favicon,
-            status_code=status_code,
-            word_count=word_count,
-            crawl_duration=crawl_duration,
+        await _run_io(
+            insert_crawl_record,
+            url, title, file_path, favicon, status_code, word_count, crawl_duration,
         )
 
         # Format and return result
@@ -513,7 +496,7 @@ def scrape_urls(urls: List[str]) -> Dict[str, str]:
     Returns:
         Dictionary mapping URL to formatted content with citations
     """
-    return asyncio.run(_scrape_urls_async(urls))
+    return _get_runner().run(_scrape_urls_async(urls))
 
 
 async def _scrape_urls_async(urls: List[str]) -> Dict[str, str]:
@@ -522,21 +505,25 @@ async def _scrape_urls_async(urls: List[str]) -> Dict[str, str]:
 
     daily_folder = get_daily_folder()
 
+    # stream=True yields each result as it finishes, so it can be saved while the rest crawl
     config = CrawlerRunConfig(
         cache_mode=CacheMode.BYPASS,
         word_count_threshold=10,
         remove_overlay_elements=True,
+        stream=True,
     )
 
     results_dict = {}
+    # File writes run in the background; their rows are written in one transaction after the loop
+    save_tasks = []
+    # arun_many yields one result type, so the raw_markdown probe runs on the first success only
+    md_has_raw = None
 
     async with AsyncWebCrawler() as crawler:
-        start_times = {url: time.time() for url in urls}
-        results = await crawler.arun_many(urls=urls, config=config)
-
-        for result in results:
+        # Every URL is submitted at once, so one batch start replaces per-URL start times
+        batch_start = time.perf_counter()
+        async for result in await crawler.arun_many(urls=urls, config=config):
             url = result.url
-            start_time = start_times.get(url, time.time())
 
             if not result.success:
                 error_msg = f"Failed to crawl {url}: {result.error_message}"
@@ -544,43 +531,65 @@ async def _scrape_urls_async(urls: List[str]) -> Dict[str, str]:
                 results_dict[url] = f"Error: {error_msg}"
                 continue
 
-            title = (
-                result.metadata.get("title", "Untitled")
-                if result.metadata
-                else "Untitled"
-            )
-            favicon = extract_favicon(result, url)
-            status_code = result.status_code
-
-            markdown_content = (
-                result.markdown.raw_markdown
-                if hasattr(result.markdown, "raw_markdown")
-                else str(result.markdown)
-            )
+            if md_has_raw is None:
+                md_has_raw = hasattr(result.markdown, "raw_markdown")
+            _, title, favicon, status_code, markdown_content = _extract_record(result, md_has_raw, url)
 
             word_count = len(markdown_content.split())
-            crawl_duration = time.time() - start_time
-
-            file_path = save_markdown(markdown_content, url, daily_folder)
-
-            insert_crawl_record(
-                url=url,
-                title=title,
-                file_path=file_path,
-                favicon=favicon,
-                status_code=status_code,
-                word_count=word_count,
-                crawl_duration=crawl_duration,
+            # Time from batch submission until this result was streamed back
+            crawl_duration = time.perf_counter() - batch_start
+
+            save_tasks.append(
+                asyncio.create_task(
+                    _save_crawl(
+                        markdown_content, url, daily_folder,
+                        title, favicon, status_code, word_count, crawl_duration,
+                    )
+                )
             )
 
             formatted_result = format_citation(title, url, favicon, markdown_content)
             results_dict[url] = formatted_result
 
+    pending_rows = await asyncio.gather(*save_tasks)
+    await _run_io(_insert_crawl_records, pending_rows)
+
     return results_dict
 
 
 # Web Searching
 
+# One DDGS client per calling thread, so its HTTP session and connection pool are reused
+# without sharing a client across threads (FastAPI's threadpool, _IO_EXECUTOR)
+_ddgs_tls = threading.local()
+_all_ddgs: List[DDGS] = []
+_all_ddgs_lock = threading.Lock()
+
+
+def _ddgs() -> DDGS:
+    """Return this thread's DDGS client, creating it on first use."""
+    client = getattr(_ddgs_tls, "client", None)
+    if client is None:
+        client = DDGS()
+        _ddgs_tls.client = client
+        with _all_ddgs_lock:
+            if not _all_ddgs:
+                atexit.register(_close_ddgs)
+            _all_ddgs.append(client)
+    return client
+
+
+def _close_ddgs() -> None:
+    with _all_ddgs_lock:
+        for client in _all_ddgs:
+            close = getattr(client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:
+                    pass
+        _all_ddgs.clear()
+
 
 def web_search(
     query: str,
@@ -605,7 +614,7 @@ def web_search(
     Returns:
         List of dictionaries containing search results with title, body, url fields.
     """
-    return DDGS().text(
+    return _ddgs().text(
         query=query,
         region=region,
         safesearch=safesearch,
@@ -639,7 +648,7 @@ def news_search(
     Returns:
         List of dictionaries containing news results with title, body, url, date, source fields.
     """
-    return DDGS().news(
+    return _ddgs().news(
         query=query,
         region=region,
         safesearch=safesearch,
@@ -671,7 +680,7 @@ def image_search(
     Returns:
         List of dictionaries containing image results with title, url, thumbnail, source fields.
     """
-    return DDGS().images(
+    return _ddgs().images(
         query=query,
         region=region,
         safesearch=safesearch,
@@ -1,18 +1,17 @@
 from py_youtube import Search, Data
 import json
+from functools import lru_cache
 from youtube_transcript_api import YouTubeTranscriptApi
 
 ytt_api = YouTubeTranscriptApi()
 # ytt_api.fetch(video_id)
 
+# Must stay a tuple: str.startswith accepts a tuple of prefixes but raises TypeError on a list
 VALID_VIDEO_ID_PREFIXES = ("https://youtu.be/", "https://www.youtube.com/watch?v=")
 
 
 def _is_valid_video_id(video_id: str):
-    if video_id.startswith(VALID_VIDEO_ID_PREFIXES):
-        return True
-
-    return False
+    return video_id.startswith(VALID_VIDEO_ID_PREFIXES)
 
 
 def youtube_search(query: str):
@@ -20,6 +19,9 @@ def youtube_search(query: str):
     return videos
 
 
+# Video data and transcripts don't change within a session; repeat lookups skip the network.
+# Invalid ids raise before anything is cached, and exceptions are never cached.
+@lru_cache(maxsize=512)
 def get_video_data(video_id: str):
     if not _is_valid_video_id(video_id):
         raise ValueError("Invalid video ID")
@@ -28,6 +30,7 @@ def get_video_data(video_id: str):
     return video
 
 
+@lru_cache(maxsize=512)
 def get_video_transcript(video_id: str):
     transcript = ytt_api.fetch(video_id)
     return transcript
@@ -1,19 +1,6 @@
 from ollama import chat, generate
 from ollama import ChatResponse
-from datetime import datetime
-import json
-
-
-def custom_json_serializer(obj):
-    """Custom JSON serializer for objects that aren't directly serializable."""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    # Try to convert object to dict if it has a __dict__ attribute
-    if hasattr(obj, "__dict__"):
-        return obj.__dict__
-    # For other objects, try to convert to string
-    return str(obj)
-
+import sys
 
 # response: ChatResponse = chat(
 #     model="granite3-moe",
@@ -34,22 +21,31 @@ def custom_json_serializer(obj):
 # print(response.message.content)
 
 
-def generate_content(query: str, system: str = "", model: str = "granite3-moe"):
-    response_obj = custom_json_serializer(
-        generate(model=model, prompt=query, system=system)
+def generate_content(
+    query: str,
+    system: str = "",
+    model: str = "granite3-moe",
+    keep_alive: str = "60m",
+):
+    """
+    Stream a generation; yields response chunks as the model produces them.
+
+    keep_alive holds the model (and its KV cache) in memory between calls. Ollama only reuses
+    the cached prompt prefix if `system` is byte-for-byte identical across requests.
+    """
+    return generate(
+        model=model, prompt=query, system=system, stream=True, keep_alive=keep_alive
     )
-    return response_obj
 
 
-print(
-    json.dumps(
-        generate_content(
-            system="Your name is Alfred, a helpful assistant. Created by 'pixelThreader' at pixelLabs",
-            query="Why Sky is blue",
-        ),
-        indent=4,
-    )
-)
+if __name__ == "__main__":
+    for chunk in generate_content(
+        system="Your name is Alfred, a helpful assistant. Created by 'pixelThreader' at pixelLabs",
+        query="Why Sky is blue",
+    ):
+        sys.stdout.write(chunk.response)
+        sys.stdout.flush()
+    print()
 
 # import json
 # from datetime import datetime
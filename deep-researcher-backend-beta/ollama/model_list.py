@@ -1,29 +1,90 @@
 import ollama
 import json
-import re
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
-# Provider patterns for regex matching on model names (case insensitive)
-provider_patterns = [
-    (r"(?i)qwen", "Alibaba"),
-    (r"(?i)gemma", "Google"),
-    (r"(?i)deepseek", "Deepseek"),
-    (r"(?i)phi", "Microsoft"),
-    (
-        r"(?i)^gpt-(3\.5|4|oss)",
-        "OpenAI",
-    ),  # Only official OpenAI GPT models (3.5 and 4 series)
-    (r"(?i)llama", "Meta"),
-    (r"(?i)granite", "IBM"),
-    (r"(?i)mistral|mixtral", "Mistral"),
-    (r"(?i)claude", "Anthropic"),
-    (r"(?i)stable", "Stability AI"),
-    (r"(?i)^yi", "Yi"),  # ^yi to avoid matching other models with yi in them
-    (r"(?i)nous", "Nous Research"),
-    (r"(?i)yi-chat", "01.AI"),
-    (r"(?i)grok", "xAI"),
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Provider keywords matched against the lowercased model name: (literals, prefix_only, provider).
+# Checked in order and the first matching rule wins, so keep the most common Ollama families first.
+# deepseek stays ahead of llama/qwen because its distills carry the base model's name
+# (deepseek-r1-distill-llama); "phi" comes after the big families since it also hits "dolphin-*".
+provider_keywords = [
+    (("deepseek",), False, "Deepseek"),
+    (("llama",), False, "Meta"),
+    (("mistral", "mixtral"), False, "Mistral"),
+    (("gemma",), False, "Google"),
+    (("qwen",), False, "Alibaba"),
+    (("phi",), False, "Microsoft"),
+    (("gpt-3.5", "gpt-4", "gpt-oss"), True, "OpenAI"),  # Only official OpenAI GPT models
+    (("granite",), False, "IBM"),
+    (("claude",), False, "Anthropic"),
+    (("stable",), False, "Stability AI"),
+    (("yi",), True, "Yi"),  # prefix only, to avoid matching other models with yi in them
+    (("nous",), False, "Nous Research"),
+    (("yi-chat",), False, "01.AI"),
+    (("grok",), False, "xAI"),
 ]
 
+# Anchored rules are plain startswith checks; the rest go into one Aho-Corasick automaton
+_provider_prefixes = [
+    (rank, literals, provider)
+    for rank, (literals, prefix_only, provider) in enumerate(provider_keywords)
+    if prefix_only
+]
+
+
+def _build_provider_automaton():
+    automaton = ahocorasick.Automaton()
+    for rank, (literals, prefix_only, provider) in enumerate(provider_keywords):
+        if not prefix_only:
+            for literal in literals:
+                automaton.add_word(literal, (rank, provider))
+    automaton.make_automaton()
+    return automaton
+
+
+_provider_automaton = _build_provider_automaton() if AHOCORASICK_AVAILABLE else None
+
+
+def detect_provider(model_name):
+    """Provider for a model name; the earliest matching rule in provider_keywords wins."""
+    low = model_name.lower()
+
+    if _provider_automaton is None:
+        # Plain substring/prefix tests run in C, with no regex dispatch per rule
+        for literals, prefix_only, provider in provider_keywords:
+            if low.startswith(literals) if prefix_only else any(lit in low for lit in literals):
+                return provider
+        return "Unknown"
+
+    best_rank, best = len(provider_keywords), "Unknown"
+    for rank, literals, provider in _provider_prefixes:
+        if low.startswith(literals):
+            best_rank, best = rank, provider
+            break
+    # One pass finds every literal; keep the highest-priority hit
+    for _, (rank, provider) in _provider_automaton.iter(low):
+        if rank < best_rank:
+            best_rank, best = rank, provider
+    return best
+
 
 def custom_json_serializer(obj):
     """Custom JSON serializer for objects that aren't directly serializable."""
@@ -36,54 +97,124 @@ def custom_json_serializer(obj):
     return str(obj)
 
 
-# Get list of all available models
-models_list = ollama.list()
-all_models_info = {}
-
-
 def get_total_models(model_list):
     return len(model_list.models)
 
 
+# One HTTP client for every list/show call, so the pool threads share warm connections
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ollama.Client()
+        return _client
+
+
+# model name -> {"modified_at": ..., "info": get_model_info result}
+MODEL_INFO_CACHE_PATH = Path.home() / ".cache" / "deep-researcher" / "model_info.json"
+
+
+def _load_model_info_cache():
+    try:
+        with open(MODEL_INFO_CACHE_PATH, encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_model_info_cache(cache):
+    try:
+        MODEL_INFO_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = MODEL_INFO_CACHE_PATH.with_suffix(".tmp")
+        # Machine-read only, so it is written compact
+        if ORJSON_AVAILABLE:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(cache, default=custom_json_serializer))
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f, separators=(",", ":"), default=custom_json_serializer)
+        # Swap in the complete file so a concurrent reader never sees a partial write
+        os.replace(tmp_path, MODEL_INFO_CACHE_PATH)
+    except OSError as e:
+        print(f"Could not write model info cache: {e}")
+
+
+def _cache_entry_fresh(entry, stamp):
+    """True if a cache entry is well-formed and matches the model's current modified_at."""
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("info"), dict)
+        and entry.get("modified_at") == stamp
+    )
+
+
 def get_all_models_info():
     """Get information for all available models"""
-    models_list = ollama.list()
-    all_models_info = []
+    models_list = _get_client().list()
+    # modified_at comes with ollama.list(), so unchanged models are served from the cache
+    stamps = {
+        model.model: custom_json_serializer(model.modified_at)
+        for model in models_list.models
+    }
+    if not stamps:
+        return []
+
+    cache = _load_model_info_cache()
+    stale = [
+        name
+        for name, stamp in stamps.items()
+        if not _cache_entry_fresh(cache.get(name), stamp)
+    ]
+    # provider is derived from the name, so rules added since the entry was cached still apply
+    for name in stamps.keys() - set(stale):
+        cache[name]["info"]["provider"] = detect_provider(name)
+
+    if stale:
+        # Each ollama.show is an independent HTTP round-trip, so overlap them
+        with ThreadPoolExecutor(max_workers=min(16, len(stale))) as executor:
+            fresh = dict(zip(stale, executor.map(get_model_info, stale)))
+        for name, info in fresh.items():
+            cache[name] = {"modified_at": stamps[name], "info": info}
 
-    for model in models_list.models:
-        model_name = model.model
-        model_info = get_model_info(model_name)
-        all_models_info.append(model_info)
+    # Drop models that are no longer installed; errors are returned but never cached
+    all_models_info = [cache[name]["info"] for name in stamps]
+    kept = {
+        name: cache[name] for name in stamps if "error" not in cache[name]["info"]
+    }
+    if stale or len(kept) != len(cache):
+        _save_model_info_cache(kept)
 
     return all_models_info
 
 
 def get_model_info(model_name):
     try:
-        model_info = ollama.show(model_name)
-        # Convert to dict for easier access
-        model_dict = json.loads(json.dumps(model_info, default=custom_json_serializer))
+        model_info = _get_client().show(model_name)
 
-        # Extract only the essential information
-        details = model_dict.get("details", {})
-        modelinfo = model_dict.get("modelinfo", {})
+        # Read only the essential fields straight off the response object
+        details = getattr(model_info, "details", None)
+        modelinfo = getattr(model_info, "modelinfo", None) or {}
+        modified_at = getattr(model_info, "modified_at", "Unknown")
 
-        # Find provider by regex matching on model name
-        provider = "Unknown"
-        for pattern, prov in provider_patterns:
-            if re.search(pattern, model_name):
-                provider = prov
-                break
+        # Find provider by matching on model name
+        provider = detect_provider(model_name)
 
         return {
             "model": model_name,
             "provider": provider,
-            "family": details.get("family", "Unknown"),
-            "parameter_size": details.get("parameter_size", "Unknown"),
-            "quantization_level": details.get("quantization_level", "Unknown"),
+            "family": getattr(details, "family", "Unknown"),
+            "parameter_size": getattr(details, "parameter_size", "Unknown"),
+            "quantization_level": getattr(details, "quantization_level", "Unknown"),
             "architecture": modelinfo.get("general.architecture", "Unknown"),
             "parameter_count": modelinfo.get("general.parameter_count", "Unknown"),
-            "modified_at": model_dict.get("modified_at", "Unknown"),
+            "modified_at": (
+                modified_at.isoformat() if isinstance(modified_at, datetime) else modified_at
+            ),
         }
     except Exception as e:
         return {
@@ -99,9 +230,24 @@ def get_model_info(model_name):
         }
 
 
-# Get information for all models
-all_models = get_all_models_info()
-print(json.dumps(all_models, indent=2))
+if __name__ == "__main__":
+    # Get information for all models
+    all_models = get_all_models_info()
+    if ORJSON_AVAILABLE:
+        # orjson renders the indented output in native code
+        sys.stdout.buffer.write(
+            orjson.dumps(
+                all_models,
+                default=custom_json_serializer,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+            )
+        )
+        sys.stdout.flush()
+    else:
+        # Stdlib indent= goes through the slow pure-Python encoder; emit compact JSON
+        # straight to stdout instead (pipe through `jq` for a readable view)
+        json.dump(all_models, sys.stdout, separators=(",", ":"), default=custom_json_serializer)
+        print()
 
 
 # print(f"Found {len(models_list.models)} models. Gathering information...")